@@ -0,0 +1,334 @@
+"""
+Almacén analítico local en SQLite.
+
+Un job de sincronización vuelca desde jira_api los sprints de un tablero con
+sus issues, la pertenencia de cada issue al sprint (con su estado y tipo al
+cierre), los worklogs del período y las transiciones del changelog, en tablas
+indexadas. Sobre ellas, las métricas entre sprints y por desarrollador son
+agregados SQL en lugar de nuevas descargas de Jira.
+
+Se activa con METRICS_BACKEND = "sqlite" en config.py; la sincronización se
+lanza con POST /api/analytics/sync/<board_id> o desde la línea de comandos:
+
+    python analytics_store.py <board_id>
+
+Antes de responder desde SQL se compara la versión de datos sincronizada de
+cada sprint con la actual en Jira (y, en la velocidad, el listado vigente de
+sprints cerrados). Si algo cambió, la consulta devuelve None para que se use
+el cálculo en vivo y se encola en segundo plano la sincronización pendiente.
+Una versión ya verificada no se vuelve a consultar durante
+ANALYTICS_FRESHNESS_TTL segundos, así que las consultas seguidas no hacen
+ninguna llamada a Jira.
+"""
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+import config
+from issue_timeline import get_timeline
+from jira_api import get_sprint_data_version, get_sprint_data_versions, get_sprint_details, get_sprint_issues, get_sprints_for_board
+from memory_cache import create_cache
+from sprint_cache import CACHE_DIR
+from sprint_metrics import COMPLETED_AT_CLOSE, DONE_STATUSES, get_sprint_end_datetime
+
+DB_PATH = getattr(config, 'ANALYTICS_DB', os.path.join(CACHE_DIR, 'analytics.db'))
+METRICS_BACKEND = getattr(config, 'METRICS_BACKEND', 'live')
+ANALYTICS_FRESHNESS_TTL = getattr(config, 'ANALYTICS_FRESHNESS_TTL', 300)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sprints (
+    id INTEGER PRIMARY KEY,
+    board_id INTEGER,
+    name TEXT,
+    state TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    data_version TEXT,
+    synced_at TEXT
+);
+CREATE TABLE IF NOT EXISTS issues (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    summary TEXT,
+    issue_type TEXT,
+    status TEXT,
+    assignee TEXT,
+    priority TEXT,
+    story_points REAL,
+    created TEXT,
+    resolved TEXT,
+    parent_summary TEXT
+);
+CREATE TABLE IF NOT EXISTS sprint_issues (
+    sprint_id INTEGER NOT NULL,
+    issue_id TEXT NOT NULL,
+    status_at_close TEXT,
+    type_at_close TEXT,
+    time_spent REAL,
+    PRIMARY KEY (sprint_id, issue_id)
+);
+CREATE TABLE IF NOT EXISTS worklogs (
+    id TEXT NOT NULL,
+    sprint_id INTEGER NOT NULL,
+    issue_id TEXT NOT NULL,
+    author TEXT,
+    started TEXT,
+    hours REAL,
+    PRIMARY KEY (sprint_id, id)
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    issue_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    from_value TEXT,
+    to_value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sprints_board ON sprints (board_id, state, start_date);
+CREATE INDEX IF NOT EXISTS idx_issues_assignee ON issues (assignee);
+CREATE INDEX IF NOT EXISTS idx_sprint_issues_issue ON sprint_issues (issue_id);
+CREATE INDEX IF NOT EXISTS idx_worklogs_issue ON worklogs (issue_id);
+CREATE INDEX IF NOT EXISTS idx_worklogs_author ON worklogs (author, sprint_id);
+CREATE INDEX IF NOT EXISTS idx_transitions_issue ON transitions (issue_id, field, changed_at);
+"""
+
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+# Sincronizaciones en segundo plano: de a una, sin repetir las ya encoladas
+_sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analytics-sync')
+_pending_syncs = set()
+_pending_lock = threading.Lock()
+
+# sprint_id -> versión de datos ya comprobada contra Jira (ver stale_sprints)
+_verified_versions = create_cache('analytics_freshness', ttl=ANALYTICS_FRESHNESS_TTL, maxsize=4096)
+
+@contextmanager
+def _connect():
+    """
+    Conexión nueva por llamada (sqlite3 no comparte conexiones entre hilos),
+    dentro de una transacción que se confirma al salir.
+    """
+    global _schema_ready
+    os.makedirs(os.path.dirname(DB_PATH) or '.', exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    with _schema_lock:
+        if not _schema_ready:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            _schema_ready = True
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def is_enabled():
+    return METRICS_BACKEND == 'sqlite'
+
+def _iso(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else None
+
+def _synced_version(conn, sprint_id):
+    row = conn.execute('SELECT data_version FROM sprints WHERE id = ?', (sprint_id,)).fetchone()
+    return row['data_version'] if row else None
+
+def sync_sprint(sprint_id, board_id=None, force=False):
+    """
+    Vuelca un sprint al almacén. Si ya está sincronizado con la misma versión
+    de datos en Jira no se descarga nada. Devuelve True si se actualizó.
+    """
+    data_version = get_sprint_data_version(sprint_id)
+    with _connect() as conn:
+        if not force and _synced_version(conn, sprint_id) == data_version:
+            _verified_versions.set(int(sprint_id), data_version)
+            return False
+
+    sprint = get_sprint_details(sprint_id)
+    issues = get_sprint_issues(sprint_id, include_changelog=True, data_version=data_version)
+    sprint_end_dt = get_sprint_end_datetime(sprint)
+
+    issue_rows = []
+    membership_rows = []
+    worklog_rows = []
+    transition_rows = []
+    for issue in issues:
+        timeline = get_timeline(issue)
+        issue_rows.append((
+            issue.id, issue.key, issue.summary, issue.issue_type, issue.status, issue.assignee,
+            issue.priority, issue.story_points, _iso(issue.created), _iso(issue.resolved), issue.parent_summary
+        ))
+        membership_rows.append((
+            sprint_id, issue.id, timeline.status_at(sprint_end_dt), timeline.type_at(sprint_end_dt), issue.time_spent
+        ))
+        worklog_rows.extend(
+            (str(worklog.id), sprint_id, issue.id, worklog.author, worklog.started, worklog.hours)
+            for worklog in issue.worklogs
+        )
+        for field, changes in (('status', issue.status_changes), ('issuetype', issue.type_changes)):
+            transition_rows.extend(
+                (issue.id, field, _iso(change.when), change.from_value, change.to_value)
+                for change in changes
+            )
+
+    # Todo el sprint en una transacción: quien consulta ve el estado anterior o el nuevo
+    with _connect() as conn:
+        conn.execute('DELETE FROM sprint_issues WHERE sprint_id = ?', (sprint_id,))
+        conn.execute('DELETE FROM worklogs WHERE sprint_id = ?', (sprint_id,))
+        conn.executemany(
+            'INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', issue_rows
+        )
+        conn.executemany('INSERT INTO sprint_issues VALUES (?, ?, ?, ?, ?)', membership_rows)
+        conn.executemany('INSERT OR REPLACE INTO worklogs VALUES (?, ?, ?, ?, ?, ?)', worklog_rows)
+        conn.executemany(
+            'DELETE FROM transitions WHERE issue_id = ?', [(row[0],) for row in issue_rows]
+        )
+        conn.executemany('INSERT INTO transitions VALUES (?, ?, ?, ?, ?)', transition_rows)
+        conn.execute(
+            'INSERT OR REPLACE INTO sprints VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                sprint['id'], board_id if board_id is not None else sprint.get('originBoardId'),
+                sprint['name'], sprint.get('state', ''), sprint.get('startDate'), sprint.get('endDate'),
+                data_version, datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
+        )
+    _verified_versions.set(int(sprint_id), data_version)
+    return True
+
+def sync_board(board_id, force=False):
+    """Sincroniza los sprints cerrados y activos del tablero; los que fallan se informan."""
+    result = {'board_id': board_id, 'synced': [], 'unchanged': [], 'errors': []}
+    for sprint in get_sprints_for_board(board_id):
+        if sprint['state'].upper() not in ['CLOSED', 'ACTIVE']:
+            continue
+        try:
+            updated = sync_sprint(sprint['id'], board_id, force)
+        except Exception as e:
+            print(f"Error syncing sprint {sprint['id']}: {str(e)}")
+            result['errors'].append({'sprint_id': sprint['id'], 'error': str(e)})
+            continue
+        result['synced' if updated else 'unchanged'].append(sprint['id'])
+    return result
+
+def _placeholders(values):
+    return ', '.join('?' for _ in values)
+
+def _schedule(key, fn, *args):
+    with _pending_lock:
+        if key in _pending_syncs:
+            return
+        _pending_syncs.add(key)
+
+    def run():
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Error in background analytics sync {key}: {str(e)}")
+        finally:
+            with _pending_lock:
+                _pending_syncs.discard(key)
+
+    _sync_executor.submit(run)
+
+def schedule_board_sync(board_id):
+    """Encola la sincronización del tablero en segundo plano."""
+    _schedule(('board', board_id), sync_board, board_id)
+
+def stale_sprints(sprint_ids):
+    """
+    Sprints que faltan en el almacén o cuya versión de datos en Jira cambió
+    desde la última sincronización. Las versiones verificadas hace menos de
+    ANALYTICS_FRESHNESS_TTL segundos no se consultan; el resto se pide a Jira
+    en paralelo.
+    """
+    if not sprint_ids:
+        return []
+    with _connect() as conn:
+        rows = conn.execute(
+            f'SELECT id, data_version FROM sprints WHERE id IN ({_placeholders(sprint_ids)})',
+            [int(sprint_id) for sprint_id in sprint_ids]
+        ).fetchall()
+    synced = {row['id']: row['data_version'] for row in rows}
+    missing = [sprint_id for sprint_id in sprint_ids if synced.get(int(sprint_id)) is None]
+    if missing:
+        return missing
+
+    unverified = []
+    for sprint_id in sprint_ids:
+        found, version = _verified_versions.get(int(sprint_id))
+        if not found or version != synced[int(sprint_id)]:
+            unverified.append(sprint_id)
+    stale = []
+    for sprint_id, version in get_sprint_data_versions(unverified).items():
+        if version == synced[int(sprint_id)]:
+            _verified_versions.set(int(sprint_id), version)
+        else:
+            stale.append(sprint_id)
+    return stale
+
+def get_velocity(board_id, limit=5):
+    """
+    Velocidad de los últimos `limit` sprints cerrados del tablero: puntos de
+    los issues que hoy están en estado final, como /api/metrics/velocity.
+    Devuelve None (y encola la sincronización) si alguno de esos sprints no
+    está en el almacén o cambió en Jira.
+    """
+    closed = [s for s in get_sprints_for_board(board_id) if s['state'].upper() in ['CLOSED']]
+    recent = sorted(closed, key=lambda x: x['startDate'] if x.get('startDate') else '', reverse=True)[:limit]
+    sprint_ids = [sprint['id'] for sprint in recent]
+    if not sprint_ids:
+        return None
+    if stale_sprints(sprint_ids):
+        schedule_board_sync(board_id)
+        return None
+
+    query = f"""
+        SELECT s.id, s.name, COALESCE(SUM(CASE WHEN UPPER(i.status) IN ({_placeholders(DONE_STATUSES)})
+                                          THEN i.story_points END), 0) AS completed_points
+        FROM sprints s
+        LEFT JOIN sprint_issues si ON si.sprint_id = s.id
+        LEFT JOIN issues i ON i.id = si.issue_id
+        WHERE s.id IN ({_placeholders(sprint_ids)})
+        GROUP BY s.id, s.name
+    """
+    with _connect() as conn:
+        rows = {row['id']: row for row in conn.execute(query, DONE_STATUSES + sprint_ids)}
+    # Mismo orden que el cálculo en vivo: del sprint más reciente al más viejo
+    points = [rows[sprint_id]['completed_points'] for sprint_id in sprint_ids]
+    return {
+        'sprints': [rows[sprint_id]['name'] for sprint_id in sprint_ids],
+        'completed_points': points,
+        'average': sum(points) / len(points),
+        'errors': []
+    }
+
+def get_developer_history(board_id):
+    """Horas registradas por desarrollador y sprint en todo el historial sincronizado del tablero."""
+    query = """
+        SELECT w.author, s.id AS sprint_id, s.name AS sprint_name, SUM(w.hours) AS hours, COUNT(*) AS worklogs
+        FROM sprints s
+        JOIN worklogs w ON w.sprint_id = s.id
+        WHERE s.board_id = ?
+        GROUP BY w.author, s.id
+        ORDER BY w.author, s.start_date
+    """
+    history = {}
+    with _connect() as conn:
+        for row in conn.execute(query, (board_id,)):
+            history.setdefault(row['author'], []).append({
+                'sprint_id': row['sprint_id'],
+                'sprint_name': row['sprint_name'],
+                'hours': row['hours'],
+                'worklogs': row['worklogs']
+            })
+    return history
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print('Uso: python analytics_store.py <board_id>')
+        sys.exit(1)
+    print(sync_board(int(sys.argv[1])))
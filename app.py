@@ -1,13 +1,21 @@
 from flask import Flask, render_template, jsonify, send_file, Response, request, send_from_directory
 import os
-from jira_api import get_sprints, get_issues_with_details, get_sprint_details, get_sprint_name, get_task_summary, get_projects, get_boards_for_project, get_sprints_for_board, URL
-from openpyxl import Workbook
-from io import BytesIO
+from jira_api import get_sprints, get_issues_with_details, get_sprint_issues, get_sprint_details, get_sprint_name, get_task_summary, get_projects, get_boards_for_project, get_sprints_for_board, get_pool_stats, URL
+from memory_cache import get_stats as get_cache_stats
+from sprint_metrics import get_sprint_metrics, get_many_sprint_metrics, iter_sprint_metrics, refresh_sprint_metrics, COMPLETED_AT_CLOSE
+from sprint_table import Categorical, group_count, group_sum
+from board_history import build_board_history
+import analytics_store
+import numpy as np
+from xlsx_export import StreamingWorkbook, send_workbook, XLSX_MIMETYPE
+from export_cache import data_versions, export_etag, cached_path, cached_response, stream_and_store
+import export_cache
+import export_jobs
+import columnar_export
 from datetime import datetime
 import pytz
 import json  # Agregar esta importación
 import csv
-import io
 
 app = Flask(__name__)
 
@@ -61,6 +69,14 @@ def api_board_sprints(board_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache/stats')
+def api_cache_stats():
+    return jsonify(get_cache_stats())
+
+@app.route('/api/jira/stats')
+def api_jira_stats():
+    return jsonify(get_pool_stats())
+
 @app.route('/api/sprints')
 def api_sprints():
     sprints = get_sprints()
@@ -75,390 +91,187 @@ def api_sprint_details(sprint_id):
 
 @app.route('/api/sprints/<int:sprint_id>/issues/download')
 def download_sprint_issues(sprint_id):
-    issues = get_issues_with_details(sprint_id)
+    versions = data_versions([sprint_id])
+    etag = export_etag('issues.xlsx', [sprint_id], versions)
+    cached = cached_response(etag, XLSX_MIMETYPE)
+    if cached is not None:
+        return cached
+    issues = get_sprint_issues(sprint_id, data_version=versions.get(sprint_id))
     sprint_name = get_sprint_name(sprint_id)
-    wb = Workbook()
+    wb = StreamingWorkbook()
 
     # Hoja de Worklogs
-    ws_worklogs = wb.active
-    ws_worklogs.title = "Worklogs"
-    ws_worklogs.append(["Task Key", "Summary", "Type", "User", "Time Spent (hours)", "Link"])
-
-    for issue in issues:
-        issue_key = issue['key']
-        issue_summary = issue['fields']['summary']
-        issue_type = issue['fields']['issuetype']['name']
-        issue_link = f"{URL}/browse/{issue_key}"
-        if issue['worklogs']:
-            for worklog in issue['worklogs']:
-                ws_worklogs.append([issue_key, issue_summary, issue_type, worklog['author']['displayName'], worklog['timeSpentHours'], issue_link])
-        else:
-            ws_worklogs.append([issue_key, issue_summary, issue_type, "", 0, issue_link])
+    def worklog_rows():
+        yield ["Task Key", "Summary", "Type", "User", "Time Spent (hours)", "Link"]
+        for issue in issues:
+            issue_link = f"{URL}/browse/{issue.key}"
+            if issue.worklogs:
+                for worklog in issue.worklogs:
+                    yield [issue.key, issue.summary, issue.issue_type, worklog.author, worklog.hours, issue_link]
+            else:
+                yield [issue.key, issue.summary, issue.issue_type, "", 0, issue_link]
 
     # Hoja de Issues
-    ws_issues = wb.create_sheet(title="Issues")
-    ws_issues.append(["Task Key", "Summary", "Status", "Story Points"])
-
-    for issue in issues:
-        issue_key = issue['key']
-        issue_summary = issue['fields']['summary']
-        issue_status = issue['fields']['status']['name']
-        story_points = issue['fields'].get('story_points', 0)
-        ws_issues.append([issue_key, issue_summary, issue_status, story_points])
+    def issue_rows():
+        yield ["Task Key", "Summary", "Status", "Story Points"]
+        for issue in issues:
+            yield [issue.key, issue.summary, issue.status, issue.story_points]
 
-    file_stream = BytesIO()
-    wb.save(file_stream)
-    file_stream.seek(0)
+    wb.add_sheet("Worklogs", worklog_rows, fit_columns=False)
+    wb.add_sheet("Issues", issue_rows, fit_columns=False)
 
-    return send_file(file_stream, as_attachment=True, download_name=f"{sprint_name}_worklogs.xlsx")
+    return send_workbook(wb, f"{sprint_name}_worklogs.xlsx", etag)
 
 @app.route('/api/sprints/<int:sprint_id>/worklogs/download')
 def download_sprint_worklogs(sprint_id):
-    issues = get_issues_with_details(sprint_id)
+    versions = data_versions([sprint_id])
+    etag = export_etag('worklogs.xlsx', [sprint_id], versions)
+    cached = cached_response(etag, XLSX_MIMETYPE)
+    if cached is not None:
+        return cached
+    issues = get_sprint_issues(sprint_id, data_version=versions.get(sprint_id))
     sprint_name = get_sprint_name(sprint_id)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Worklogs"
-    
-    # Encabezados
-    headers = ["Task Key", "Summary", "Issue Type", "User", "Time Spent (hours)", "Link", "Started"]
-    ws.append(headers)
-    
-    # Datos
-    for issue in issues:
-        if issue['worklogs']:
-            for worklog in issue['worklogs']:
-                ws.append([
-                    issue['key'],
-                    issue['fields']['summary'],
-                    issue['fields']['issuetype']['name'],
-                    worklog['author']['displayName'],
-                    worklog['timeSpentHours'],
-                    f"{URL}/browse/{issue['key']}",
-                    worklog['started']
-                ])
-    
-    # Ajustar ancho de columnas
-    for column in ws.columns:
-        max_length = 0
-        column = list(column)
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = (max_length + 2)
-        ws.column_dimensions[column[0].column_letter].width = adjusted_width
-
-    file_stream = BytesIO()
-    wb.save(file_stream)
-    file_stream.seek(0)
     
-    return send_file(
-        file_stream,
-        as_attachment=True,
-        download_name=f"{sprint_name}_detailed_worklogs.xlsx"
-    )
-
-def analyze_story_points_vs_time(story_points, time_spent):
-    if story_points is None or story_points == 0:
-        return ""
-    
-    # Definir rangos de horas para cada punto
-    ranges = {
-        1: (0, 2),
-        2: (2, 4),
-        3: (4, 8),
-        5: (8, 16),
-        8: (16, 24)
-    }
-    
-    expected_range = ranges.get(story_points)
-    if expected_range is None:
-        return ""
-    
-    if time_spent < expected_range[0]:
-        return "Sobre-estimado"
-    elif time_spent > expected_range[1]:
-        return "Sub-estimado"
-    else:
-        return "Correcto"
+    def rows():
+        # Encabezados
+        yield ["Task Key", "Summary", "Issue Type", "User", "Time Spent (hours)", "Link", "Started"]
+        # Datos
+        for issue in issues:
+            for worklog in issue.worklogs:
+                yield [
+                    issue.key,
+                    issue.summary,
+                    issue.issue_type,
+                    worklog.author,
+                    worklog.hours,
+                    f"{URL}/browse/{issue.key}",
+                    worklog.started
+                ]
+    
+    wb = StreamingWorkbook()
+    wb.add_sheet("Worklogs", rows)
+    return send_workbook(wb, f"{sprint_name}_detailed_worklogs.xlsx", etag)
+
+ANALYSIS_HEADERS = [
+    "Issue Type",
+    "Issue Key",
+    "Summary",
+    "Assignee",
+    "Status",
+    "Time Spent",
+    "Story Points",
+    "Story Points vs Time",
+    "Parent Summary",
+    "Fecha de Creación"
+]
+
+def analysis_row(issue):
+    """Fila del análisis de sprint a partir de un elemento de detailed_issues."""
+    return [
+        issue['issue_type'],
+        issue['issue_key'],
+        issue['summary'],
+        issue['assignee'],
+        issue['status'],  # estado al cierre del sprint
+        issue['time_spent'],  # valor numérico - worklogs ya filtrados por sprint
+        issue['story_points'] if issue['story_points'] > 0 else None,  # valor numérico o celda vacía
+        issue['story_points_analysis'],
+        issue['parent_summary'],
+        issue['fecha_creacion']
+    ]
 
 @app.route('/api/sprints/<int:sprint_id>/analysis/download')
 def download_sprint_analysis(sprint_id):
-    issues = get_issues_with_details(sprint_id)
-    sprint_details = get_sprint_details(sprint_id)
+    versions = data_versions([sprint_id])
+    etag = export_etag('analysis.xlsx', [sprint_id], versions)
+    cached = cached_response(etag, XLSX_MIMETYPE)
+    if cached is not None:
+        return cached
+    sprint_metrics = get_sprint_metrics(sprint_id, data_version=versions.get(sprint_id))['comprehensive']
     sprint_name = get_sprint_name(sprint_id)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sprint Analysis"
     
-    headers = [
-        "Issue Type",
-        "Issue Key",
-        "Summary",
-        "Assignee",
-        "Status",
-        "Time Spent",
-        "Story Points",
-        "Story Points vs Time",
-        "Parent Summary",
-        "Fecha de Creación"
-    ]
-    ws.append(headers)
+    def rows():
+        yield ANALYSIS_HEADERS
+        # Estado al cierre del sprint (changelog) y análisis de estimación ya calculados
+        for issue in sprint_metrics['detailed_issues']:
+            yield analysis_row(issue)
+    
+    wb = StreamingWorkbook()
+    wb.add_sheet("Sprint Analysis", rows)
+    return send_workbook(wb, f"{sprint_name}_sprint_analysis.xlsx", etag)
+
+def columnar_args():
+    """
+    Tabla (?table=issues|worklogs) y formato (?format=parquet|arrow) de una
+    exportación columnar. Devuelve `(table, fmt, error_response)`.
+    """
+    table = request.args.get('table', 'issues')
+    fmt = request.args.get('format', 'parquet')
+    if table not in columnar_export.TABLES:
+        return table, fmt, (jsonify({'error': 'table debe ser issues o worklogs'}), 400)
+    if fmt not in columnar_export.FORMATS:
+        return table, fmt, (jsonify({'error': 'format debe ser parquet o arrow'}), 400)
+    if not columnar_export.is_available():
+        return table, fmt, (jsonify({'error': 'La exportación columnar requiere el paquete pyarrow (pip install -r requirements-optional.txt)'}), 501)
+    return table, fmt, None
+
+@app.route('/api/sprints/<int:sprint_id>/analysis/download_columnar')
+def download_sprint_columnar(sprint_id):
+    """
+    Issues del análisis o worklogs del sprint como archivo Parquet / Arrow
+    con tipos (ver columnar_export).
+    """
+    table, fmt, error = columnar_args()
+    if error is not None:
+        return error
+    extension, mimetype = columnar_export.FORMATS[fmt]
+    versions = data_versions([sprint_id])
+    etag = export_etag(f'{table}.{extension}', [sprint_id], versions)
+    cached = cached_response(etag, mimetype)
+    if cached is not None:
+        return cached
     
-    # Obtener fecha de fin del sprint como datetime
-    sprint_end = sprint_details.get('endDate')
-    if sprint_end:
-        # Ajustar la hora de cierre del sprint a las 23:59
-        sprint_end_date = datetime.strptime(sprint_end, '%Y-%m-%d %H:%M:%S').date()
-        sprint_end_dt = datetime.combine(sprint_end_date, datetime.max.time().replace(hour=23, minute=59, second=59, microsecond=0))
+    sprint_name = get_sprint_name(sprint_id)
+    if table == 'issues':
+        sprint_metrics = get_sprint_metrics(sprint_id, data_version=versions.get(sprint_id))
+        rows = columnar_export.issue_rows(sprint_id, sprint_name, sprint_metrics['comprehensive']['detailed_issues'])
     else:
-        sprint_end_dt = None
+        rows = columnar_export.worklog_rows(sprint_id, sprint_name, get_sprint_issues(sprint_id, data_version=versions.get(sprint_id)))
     
-    for issue in issues:
-        issue_type = issue['fields']['issuetype']['name']
-        issue_key = issue['key']
-        summary = issue['fields'].get('summary', '')
-        
-        assignee = ''
-        if issue['fields'].get('assignee'):
-            assignee = issue['fields']['assignee'].get('displayName', '')
-        
-        # --- Estado al final del sprint usando changelog ---
-        status = issue['fields']['status']['name']
-        status_at_sprint_end = status
-        changelog = issue.get('changelog', {}).get('histories', [])
-        
-        if sprint_end_dt:
-            # Ordenar el changelog por fecha para procesar cronológicamente
-            sorted_changelog = sorted(changelog, key=lambda x: x.get('created', ''))
-            
-            # Buscar el estado inicial y el último estado antes del cierre del sprint
-            initial_status = None
-            last_status_before_sprint_end = None
-            
-            for history in sorted_changelog:
-                change_date = history.get('created')
-                if change_date:
-                    try:
-                        change_dt = datetime.strptime(change_date.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                        
-                        for item in history.get('items', []):
-                            if item.get('field') == 'status':
-                                # Guardar el estado inicial (fromString del primer cambio)
-                                if initial_status is None:
-                                    initial_status = item.get('fromString')
-                                
-                                # Si este cambio ocurrió antes o durante el sprint, actualizar el último estado
-                                if change_dt <= sprint_end_dt:
-                                    last_status_before_sprint_end = item.get('toString')
-                        
-                    except Exception:
-                        pass
-            
-            # Determinar el estado al cierre del sprint
-            if last_status_before_sprint_end:
-                # Si hubo cambios antes del cierre, usar el último estado
-                status_at_sprint_end = last_status_before_sprint_end
-            elif initial_status:
-                # Si no hubo cambios antes del cierre, usar el estado inicial
-                status_at_sprint_end = initial_status
-            else:
-                # Si no hay changelog, usar el estado actual como fallback
-                status_at_sprint_end = status
-        
-        time_spent = sum(worklog['timeSpentHours'] for worklog in issue['worklogs'])
-        
-        # Manejo explícito de Story Points usando el campo normalizado
-        story_points = float(issue['fields'].get('story_points', 0) or 0)
-            
-        # Solo analizar story points vs tiempo si la issue está finalizada (Code Review, For Release, Done)
-        if status_at_sprint_end in ['CODE REVIEW', 'For Release', 'Done']:
-            story_points_analysis = analyze_story_points_vs_time(story_points, time_spent)
-        else:
-            story_points_analysis = ""
-        
-        parent_summary = ""
-        if issue['fields'].get('parent'):
-            parent_fields = issue['fields']['parent'].get('fields', {})
-            parent_summary = parent_fields.get('summary', '')
-        
-        # Obtener la fecha de creación
-        fecha_creacion = issue['fields'].get('created', '')
-        if fecha_creacion:
-            try:
-                # Convertir a formato legible
-                fecha_dt = datetime.strptime(fecha_creacion.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                fecha_creacion = fecha_dt.strftime('%Y-%m-%d %H:%M:%S')
-            except:
-                fecha_creacion = fecha_creacion
-        
-        row = [
-            issue_type,
-            issue_key,
-            summary,
-            assignee,
-            status_at_sprint_end,
-            time_spent,  # valor numérico - worklogs ya filtrados por sprint
-            story_points if story_points > 0 else None,  # valor numérico o celda vacía
-            story_points_analysis,
-            parent_summary,
-            fecha_creacion
-        ]
-        ws.append(row)
+    def write(fileobj):
+        columnar_export.write(fileobj, table, fmt, [rows])
+    
+    return export_cache.send_export(etag, f"{sprint_name}_{table}.{extension}", mimetype, write)
 
-    # Ajustar ancho de columnas
-    for column in ws.columns:
-        max_length = 0
-        column = list(column)
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = (max_length + 2)
-        ws.column_dimensions[column[0].column_letter].width = adjusted_width
+class _CsvLine:
+    """Destino de csv.writer que devuelve la línea escrita en lugar de acumularla."""
+    def write(self, line):
+        return line
 
-    file_stream = BytesIO()
-    wb.save(file_stream)
-    file_stream.seek(0)
-    
-    return send_file(
-        file_stream,
-        as_attachment=True,
-        download_name=f"{sprint_name}_sprint_analysis.xlsx"
-    )
+def iter_csv(rows):
+    """Convierte un iterable de filas en líneas CSV, a medida que se generan."""
+    writer = csv.writer(_CsvLine())
+    for row in rows:
+        yield writer.writerow(row)
 
 @app.route('/api/sprints/<int:sprint_id>/analysis/download_csv')
 def download_sprint_analysis_csv(sprint_id):
-    issues = get_issues_with_details(sprint_id)
-    sprint_details = get_sprint_details(sprint_id)
+    versions = data_versions([sprint_id])
+    etag = export_etag('analysis.csv', [sprint_id], versions)
+    cached = cached_response(etag, 'text/csv')
+    if cached is not None:
+        return cached
     sprint_name = get_sprint_name(sprint_id)
     
-    headers = [
-        "Issue Type",
-        "Issue Key",
-        "Summary",
-        "Assignee",
-        "Status",
-        "Time Spent",
-        "Story Points",
-        "Story Points vs Time",
-        "Parent Summary",
-        "Fecha de Creación"
-    ]
-    
-    # Obtener fecha de fin del sprint como datetime
-    sprint_end = sprint_details.get('endDate')
-    if sprint_end:
-        sprint_end_date = datetime.strptime(sprint_end, '%Y-%m-%d %H:%M:%S').date()
-        sprint_end_dt = datetime.combine(sprint_end_date, datetime.max.time().replace(hour=23, minute=59, second=59, microsecond=0))
-    else:
-        sprint_end_dt = None
-    
     def generate():
-        output = []
-        output.append(headers)
-        for issue in issues:
-            issue_type = issue['fields']['issuetype']['name']
-            issue_key = issue['key']
-            summary = issue['fields'].get('summary', '')
-            assignee = ''
-            if issue['fields'].get('assignee'):
-                assignee = issue['fields']['assignee'].get('displayName', '')
-            # Estado al final del sprint usando changelog
-            status = issue['fields']['status']['name']
-            status_at_sprint_end = status
-            changelog = issue.get('changelog', {}).get('histories', [])
-            
-            if sprint_end_dt:
-                # Ordenar el changelog por fecha para procesar cronológicamente
-                sorted_changelog = sorted(changelog, key=lambda x: x.get('created', ''))
-                
-                # Buscar el estado inicial y el último estado antes del cierre del sprint
-                initial_status = None
-                last_status_before_sprint_end = None
-                
-                for history in sorted_changelog:
-                    change_date = history.get('created')
-                    if change_date:
-                        try:
-                            change_dt = datetime.strptime(change_date.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                            
-                            for item in history.get('items', []):
-                                if item.get('field') == 'status':
-                                    # Guardar el estado inicial (fromString del primer cambio)
-                                    if initial_status is None:
-                                        initial_status = item.get('fromString')
-                                    
-                                    # Si este cambio ocurrió antes o durante el sprint, actualizar el último estado
-                                    if change_dt <= sprint_end_dt:
-                                        last_status_before_sprint_end = item.get('toString')
-                            
-                        except Exception:
-                            pass
-                
-                # Determinar el estado al cierre del sprint
-                if last_status_before_sprint_end:
-                    # Si hubo cambios antes del cierre, usar el último estado
-                    status_at_sprint_end = last_status_before_sprint_end
-                elif initial_status:
-                    # Si no hubo cambios antes del cierre, usar el estado inicial
-                    status_at_sprint_end = initial_status
-                else:
-                    # Si no hay changelog, usar el estado actual como fallback
-                    status_at_sprint_end = status
-            # Los worklogs ya están filtrados por sprint en get_issues_with_details
-            time_spent = sum(worklog['timeSpentHours'] for worklog in issue['worklogs'])
-            story_points = float(issue['fields'].get('story_points', 0) or 0)
-            # Solo analizar story points vs tiempo si la issue está finalizada (Code Review, For Release, Done)
-            if status_at_sprint_end in ['CODE REVIEW', 'For Release', 'Done']:
-                story_points_analysis = analyze_story_points_vs_time(story_points, time_spent)
-            else:
-                story_points_analysis = ""
-            parent_summary = ""
-            if issue['fields'].get('parent'):
-                parent_fields = issue['fields']['parent'].get('fields', {})
-                parent_summary = parent_fields.get('summary', '')
-            # Obtener la fecha de creación
-            fecha_creacion = issue['fields'].get('created', '')
-            if fecha_creacion:
-                try:
-                    # Convertir a formato legible
-                    fecha_dt = datetime.strptime(fecha_creacion.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                    fecha_creacion = fecha_dt.strftime('%Y-%m-%d %H:%M:%S')
-                except:
-                    fecha_creacion = fecha_creacion
-            row = [
-                issue_type,
-                issue_key,
-                summary,
-                assignee,
-                status_at_sprint_end,
-                time_spent,
-                story_points if story_points > 0 else None,
-                story_points_analysis,
-                parent_summary,
-                fecha_creacion
-            ]
-            output.append(row)
-        # Escribir CSV en memoria
-        si = io.StringIO()
-        writer = csv.writer(si)
-        for row in output:
-            writer.writerow(row)
-        return si.getvalue()
-    csv_data = generate()
-    return Response(
-        csv_data,
-        mimetype='text/csv',
-        headers={
-            'Content-Disposition': f'attachment;filename={sprint_name}_sprint_analysis.csv'
-        }
-    )
+        # Los encabezados salen antes de calcular las métricas: el cliente recibe
+        # los primeros bytes enseguida aunque la carga del sprint tarde
+        yield ANALYSIS_HEADERS
+        sprint_metrics = get_sprint_metrics(sprint_id, data_version=versions.get(sprint_id))['comprehensive']
+        for issue in sprint_metrics['detailed_issues']:
+            yield analysis_row(issue)
+    
+    return stream_and_store(etag, f"{sprint_name}_sprint_analysis.csv", 'text/csv', iter_csv(generate()))
 
 @app.route('/metrics')
 def metrics_view():
@@ -471,11 +284,8 @@ def comparative_metrics_view():
 @app.route('/api/sprints/<int:sprint_id>/advanced-metrics')
 def get_advanced_metrics(sprint_id):
     try:
-        issues = get_issues_with_details(sprint_id)
-        sprint_details = get_sprint_details(sprint_id)
-        
-        # Mejorar el cálculo de la velocidad
-        velocity_data = calculate_velocity_metrics(issues)
+        sprint_metrics = get_sprint_metrics(sprint_id)
+        velocity_data = sprint_metrics['velocity']
         
         metrics = {
             'velocity': velocity_data,
@@ -484,14 +294,11 @@ def get_advanced_metrics(sprint_id):
                 'total_stories': velocity_data['total_stories']
             },
             'time_analysis': {
-                'time_distribution': calculate_time_distribution(issues),
-                'average_task_completion': calculate_average_task_completion(issues)
+                'time_distribution': sprint_metrics['time_distribution'],
+                'average_task_completion': sprint_metrics['average_task_completion']
             },
-            'team_performance': calculate_team_performance(issues),
-            'scope_changes': {
-                'added': 0,  # Estos valores se pueden calcular si tienes los campos necesarios en JIRA
-                'removed': 0
-            }
+            'team_performance': sprint_metrics['team_performance'],
+            'scope_changes': sprint_metrics['burndown']['scope_changes']
         }
         
         return jsonify(metrics)
@@ -499,10 +306,45 @@ def get_advanced_metrics(sprint_id):
         print(f"Error calculating metrics: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/sprints/<int:sprint_id>/metrics/refresh', methods=['POST'])
+def refresh_metrics_snapshot(sprint_id):
+    """Recalcula las métricas de un sprint descartando su instantánea guardada."""
+    try:
+        refresh_sprint_metrics(sprint_id)
+        return jsonify({'sprint_id': sprint_id, 'refreshed': True})
+    except Exception as e:
+        print(f"Error refreshing sprint metrics: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/sync/<int:board_id>', methods=['POST'])
+def sync_analytics_store(board_id):
+    """Sincroniza los sprints del tablero en el almacén analítico local (SQLite)."""
+    try:
+        force = request.args.get('force') == '1'
+        return jsonify(analytics_store.sync_board(board_id, force))
+    except Exception as e:
+        print(f"Error syncing analytics store: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/developers/<int:board_id>')
+def get_developer_history(board_id):
+    """Horas por desarrollador y sprint en todo el historial sincronizado del tablero."""
+    try:
+        return jsonify(analytics_store.get_developer_history(board_id))
+    except Exception as e:
+        print(f"Error reading analytics store: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/metrics/velocity/<int:board_id>')
 def get_velocity_metrics(board_id):
     """Obtener métricas de velocidad de los últimos 5 sprints completados"""
     try:
+        if analytics_store.is_enabled():
+            # Con el almacén local sincronizado, la serie es una consulta SQL sin llamadas a Jira
+            velocity_data = analytics_store.get_velocity(board_id)
+            if velocity_data is not None:
+                return jsonify(velocity_data)
+        
         sprints = get_sprints_for_board(board_id)
         # Filtrar solo sprints cerrados/completados
         completed_sprints = [s for s in sprints if s['state'].upper() in ['CLOSED']]
@@ -511,141 +353,34 @@ def get_velocity_metrics(board_id):
         velocity_data = {
             'sprints': [],
             'completed_points': [],
-            'average': 0
+            'average': 0,
+            'errors': []
         }
         
+        # Los sprints se cargan en paralelo (sin changelog: solo estado actual);
+        # uno que falla no impide mostrar el resto
+        results, errors = get_many_sprint_metrics([sprint['id'] for sprint in recent_sprints], changelog=False)
+        sprint_names = {sprint['id']: sprint['name'] for sprint in recent_sprints}
         total_points = 0
-        for sprint in recent_sprints:
-            issues = get_issues_with_details(sprint['id'])
-            completed_points = sum(
-                float(issue['fields'].get('story_points', 0) or 0)
-                for issue in issues
-                if issue['fields']['status']['name'].upper() in ['DONE', 'CLOSED', 'FOR RELEASE']
-            )
+        for sprint, sprint_metrics in zip(recent_sprints, results):
+            if sprint_metrics is None:
+                continue
+            completed_points = sprint_metrics['totals']['story_points']['completed']
             
             velocity_data['sprints'].append(sprint['name'])
             velocity_data['completed_points'].append(completed_points)
             total_points += completed_points
+        velocity_data['errors'] = [dict(error, sprint_name=sprint_names[error['sprint_id']]) for error in errors]
         
         # Calcular el promedio
-        velocity_data['average'] = total_points / len(recent_sprints) if recent_sprints else 0
+        loaded = len(velocity_data['sprints'])
+        velocity_data['average'] = total_points / loaded if loaded else 0
         
         return jsonify(velocity_data)
     except Exception as e:
         print(f"Error calculating velocity metrics: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-def calculate_velocity_metrics(issues):
-    """
-    Calcula métricas de velocidad detalladas del sprint
-    """
-    velocity_data = {
-        'committed_points': 0,    # Puntos comprometidos al inicio
-        'completed_points': 0,    # Puntos completados
-        'total_stories': 0,
-        'completed_stories': 0,
-        'story_details': []       # Para debugging
-    }
-
-    for issue in issues:
-        # Solo considerar historias y tareas técnicas (excluyendo Support, Bug y Spike que no se estiman en puntos)
-        if issue['fields']['issuetype']['name'] in ['Story', 'Task']:
-            # Obtener puntos comprometidos y completados desde el campo normalizado
-            story_points = issue['fields'].get('story_points', 0)
-            
-            if story_points:
-                story_points = float(story_points)
-                velocity_data['committed_points'] += story_points
-                velocity_data['total_stories'] += 1
-                
-                story_detail = {
-                    'key': issue['key'],
-                    'summary': issue['fields']['summary'],
-                    'type': issue['fields']['issuetype']['name'],
-                    'status': issue['fields']['status']['name'],
-                    'committed_points': story_points,
-                    'completed_points': story_points if issue['fields']['status']['name'].upper() in ['DONE', 'CLOSED', 'FOR RELEASE'] else 0
-                }
-                
-                if issue['fields']['status']['name'].upper() in ['DONE', 'CLOSED', 'FOR RELEASE']:
-                    velocity_data['completed_points'] += story_points
-                    velocity_data['completed_stories'] += 1
-                    story_detail['completed'] = True
-                else:
-                    story_detail['completed'] = False
-                
-                velocity_data['story_details'].append(story_detail)
-
-    return velocity_data
-
-def calculate_time_distribution(issues):
-    status_mapping = {
-        'TO DO': 'planning',
-        'TODO': 'planning',
-        'IN PROGRESS': 'development',
-        'CODE REVIEW': 'completed',
-        'FOR RELEASE': 'completed',
-        'DONE': 'completed',
-    }
-    
-    distribution = {
-        'planning': 0,
-        'development': 0,
-        'review': 0,
-        'testing': 0,
-        'completed': 0,
-        'other': 0  # Agregamos 'other' como categoría válida
-    }
-    
-    for issue in issues:
-        current_status = issue['fields']['status']['name'].upper()
-        mapped_status = status_mapping.get(current_status, 'other')
-        
-        for worklog in issue.get('worklogs', []):
-            distribution[mapped_status] += worklog['timeSpentHours']
-    
-    # Solo incluir categorías con horas > 0
-    return {k: v for k, v in distribution.items() if v > 0}
-
-def calculate_average_task_completion(issues):
-    completed_issues = [i for i in issues if i['fields']['status']['name'] in ['Done', 'Closed']]
-    if not completed_issues:
-        return 0
-    
-    total_days = 0
-    count = 0
-    
-    for issue in completed_issues:
-        if 'created' in issue['fields'] and 'resolutiondate' in issue['fields']:
-            try:
-                created = datetime.strptime(issue['fields']['created'].split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                resolved = datetime.strptime(issue['fields']['resolutiondate'].split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                days = (resolved - created).days
-                if days >= 0:  # Ignorar valores negativos
-                    total_days += days
-                    count += 1
-            except (ValueError, AttributeError):
-                continue
-    
-    return total_days / count if count > 0 else 0
-
-def calculate_team_performance(issues):
-    team_performance = {}
-    for issue in issues:
-        for worklog in issue.get('worklogs', []):
-            author = worklog['author']['displayName']
-            if author not in team_performance:
-                team_performance[author] = {'total_hours': 0, 'tasks_count': 0}
-            team_performance[author]['total_hours'] += worklog['timeSpentHours']
-            team_performance[author]['tasks_count'] += 1
-
-    # Calcular promedio de horas por tarea para cada miembro
-    for member in team_performance:
-        stats = team_performance[member]
-        stats['avg_hours_per_task'] = stats['total_hours'] / stats['tasks_count'] if stats['tasks_count'] > 0 else 0
-
-    return team_performance
-
 @app.route('/active')
 def active_sprint_view():
     return render_template('active_sprint.html')
@@ -659,117 +394,16 @@ def get_active_sprint(board_id):
         if not active_sprint:
             return jsonify({'error': 'No active sprint found'}), 404
             
-        issues = get_issues_with_details(active_sprint['id'])
-        
-        # Calcular métricas del sprint activo
-        metrics = {
-            'sprint': active_sprint,
-            'total_issues': len(issues),
-            'issues_by_type': {},
-            'issues_by_status': {},
-            'story_points': {
-                'total': 0,
-                'completed': 0
-            },
-            'burndown_data': calculate_burndown_data(active_sprint, issues)
-        }
+        sprint_metrics = get_sprint_metrics(active_sprint['id'])
         
-        # Contar issues por tipo
-        for issue in issues:
-            issue_type = issue['fields']['issuetype']['name']
-            metrics['issues_by_type'][issue_type] = metrics['issues_by_type'].get(issue_type, 0) + 1
-            
-            # Contar por estado
-            status = issue['fields']['status']['name']
-            metrics['issues_by_status'][status] = metrics['issues_by_status'].get(status, 0) + 1
-            
-            # Sumar story points
-            story_points = float(issue['fields'].get('story_points', 0) or 0)
-            metrics['story_points']['total'] += story_points
-            if status.upper() in ['DONE', 'CLOSED', 'FOR RELEASE']:
-                metrics['story_points']['completed'] += story_points
+        # Métricas del sprint activo
+        metrics = dict(sprint_metrics['totals'], sprint=active_sprint, burndown_data=sprint_metrics['burndown'])
         
         return jsonify(metrics)
     except Exception as e:
         print(f"Error getting active sprint: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-def calculate_burndown_data(sprint, issues):
-    """Calcula los datos para el burndown chart considerando issues completados"""
-    from datetime import datetime, timedelta
-    
-    COMPLETED_STATUSES = ['DONE', 'FOR RELEASE']
-    
-    start_date = datetime.strptime(sprint['startDate'].split('T')[0], '%Y-%m-%d')
-    end_date = datetime.strptime(sprint['endDate'].split('T')[0], '%Y-%m-%d')
-    total_days = (end_date - start_date).days + 1
-    today = datetime.now().date()
-    
-    # Calcular total de story points y puntos completados
-    total_points = 0
-    completed_points = 0
-    
-    # Primero calculamos los totales
-    for issue in issues:
-        story_points = float(issue['fields'].get('story_points', 0) or 0)
-        if story_points > 0:
-            total_points += story_points
-            if issue['fields']['status']['name'].upper() in COMPLETED_STATUSES:
-                completed_points += story_points
-
-    # Los puntos restantes son los totales menos los completados
-    remaining_points = total_points - completed_points
-    
-    ideal_burn = []
-    actual_burn = []
-    
-    # Calcular línea ideal
-    points_per_day = total_points / total_days
-    for day in range(total_days):
-        date = start_date + timedelta(days=day)
-        ideal_burn.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'points': round(total_points - (points_per_day * day), 1)
-        })
-    
-    # Calcular línea actual
-    current_date = start_date.date()
-    current_points = total_points
-    
-    while current_date <= min(today, end_date.date()):
-        # Para cada día, revisamos las issues completadas en esa fecha
-        points_completed_today = 0
-        for issue in issues:
-            if (issue['fields']['status']['name'].upper() in COMPLETED_STATUSES and
-                issue['fields'].get('resolutiondate')):
-                resolution_date = datetime.strptime(
-                    issue['fields']['resolutiondate'].split('T')[0], 
-                    '%Y-%m-%d'
-                ).date()
-                if resolution_date == current_date:
-                    story_points = float(issue['fields'].get('story_points', 0) or 0)
-                    points_completed_today += story_points
-        
-        current_points -= points_completed_today
-        
-        actual_burn.append({
-            'date': current_date.strftime('%Y-%m-%d'),
-            'points': round(current_points, 1)
-        })
-        current_date += timedelta(days=1)
-    
-    # Debug info
-    print(f"Total points: {total_points}")
-    print(f"Completed points: {completed_points}")
-    print(f"Remaining points: {remaining_points}")
-    
-    return {
-        'ideal': ideal_burn,
-        'actual': actual_burn,
-        'total_points': total_points,
-        'remaining_points': remaining_points
-    }
-
 @app.route('/api/metrics/summary/<int:board_id>')
 def get_sprint_metrics_summary(board_id):
     """
@@ -786,123 +420,100 @@ def get_sprint_metrics_summary(board_id):
         completed_sprints = [s for s in sprints if s['state'].upper() in ['CLOSED']]
         recent_sprints = sorted(completed_sprints, key=lambda x: x['startDate'] if x.get('startDate') else '', reverse=True)[:5]
         summary = []
-        for sprint in recent_sprints:
-            sprint_id = sprint['id']
-            sprint_name = sprint['name']
-            start_date = sprint.get('startDate')
-            end_date = sprint.get('endDate')
-            issues = get_issues_with_details(sprint_id)
-            # Story points comprometidos y completados
-            committed_points = 0
-            completed_points = 0
-            committed_issues = 0
-            completed_issues = 0
-            issue_type_dist = {}
-            bugs_created = 0
-            bugs_resolved = 0
-            bug_severity = {}
-            bug_resolution_times = []
-            support_created = 0
-            support_resolved = 0
-            support_priority = {}
-            support_resolution_times = []
-            for issue in issues:
-                print(f"Issue: {issue}")
-                issue_type = issue['fields']['issuetype']['name']
-                print(f"Issue Type: {issue['fields']['issuetype']}")
-                issue_status = issue['fields']['status']['name']
-                # Distribución de tipos
-                if issue_type not in issue_type_dist:
-                    issue_type_dist[issue_type] = 0
-                issue_type_dist[issue_type] += 1
-                # Story points
-                story_points = float(issue['fields'].get('story_points', 0) or 0)
-                # Comprometidos: todos los issues con story points (excluyendo Support, Bug y Spike que no se estiman en puntos)
-                if issue_type in ['Story', 'Task']:
-                    committed_points += story_points
-                    committed_issues += 1
-                    # Completados: solo los que están en estado final
-                    if issue_status.upper() in ['DONE', 'CLOSED', 'FOR RELEASE']:
-                        completed_points += story_points
-                        completed_issues += 1
-                # Bugs
-                if issue_type == 'Bug':
-                    bugs_created += 1
-                    # Severidad
-                    severity = issue['fields'].get('priority', {}).get('name', 'Sin severidad')
-                    if severity not in bug_severity:
-                        bug_severity[severity] = 0
-                    bug_severity[severity] += 1
-                    # Resueltos
-                    if issue_status.upper() in ['DONE', 'CLOSED', 'FOR RELEASE']:
-                        bugs_resolved += 1
-                        # Tiempo de resolución
-                        created = issue['fields'].get('created')
-                        resolved = issue['fields'].get('resolutiondate')
-                        if created and resolved:
-                            try:
-                                created_dt = datetime.strptime(created.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                                resolved_dt = datetime.strptime(resolved.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                                days = (resolved_dt - created_dt).days
-                                if days >= 0:
-                                    bug_resolution_times.append(days)
-                            except Exception:
-                                pass
-                
-                # Support
-                if issue_type == 'Support':
-                    support_created += 1
-                    # Prioridad
-                    priority = issue['fields'].get('priority', {}).get('name', 'Sin prioridad')
-                    if priority not in support_priority:
-                        support_priority[priority] = 0
-                    support_priority[priority] += 1
-                    # Resueltos
-                    if issue_status.upper() in ['DONE', 'CLOSED', 'FOR RELEASE']:
-                        support_resolved += 1
-                        # Tiempo de resolución
-                        created = issue['fields'].get('created')
-                        resolved = issue['fields'].get('resolutiondate')
-                        if created and resolved:
-                            try:
-                                created_dt = datetime.strptime(created.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                                resolved_dt = datetime.strptime(resolved.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                                days = (resolved_dt - created_dt).days
-                                if days >= 0:
-                                    support_resolution_times.append(days)
-                            except Exception:
-                                pass
-            # Ratio de fiabilidad
-            say_do_ratio = (completed_points / committed_points * 100) if committed_points > 0 else 0
-            avg_bug_resolution = sum(bug_resolution_times) / len(bug_resolution_times) if bug_resolution_times else 0
-            avg_support_resolution = sum(support_resolution_times) / len(support_resolution_times) if support_resolution_times else 0
-            summary.append({
-                'sprint_id': sprint_id,
-                'sprint_name': sprint_name,
-                'start_date': start_date,
-                'end_date': end_date,
-                'committed_points': committed_points,
-                'completed_points': completed_points,
-                'say_do_ratio': say_do_ratio,
-                'issue_type_distribution': issue_type_dist,
-                'bugs': {
-                    'created': bugs_created,
-                    'resolved': bugs_resolved,
-                    'severity': bug_severity,
-                    'avg_resolution_days': avg_bug_resolution
-                },
-                'support': {
-                    'created': support_created,
-                    'resolved': support_resolved,
-                    'priority': support_priority,
-                    'avg_resolution_days': avg_support_resolution
-                }
-            })
+        # Los sprints se cargan en paralelo (sin changelog: solo estado actual);
+        # los que fallan se informan con su error
+        results, errors = get_many_sprint_metrics([sprint['id'] for sprint in recent_sprints], changelog=False)
+        errors_by_sprint = {error['sprint_id']: error['error'] for error in errors}
+        for sprint, sprint_metrics in zip(recent_sprints, results):
+            sprint_info = {
+                'sprint_id': sprint['id'],
+                'sprint_name': sprint['name'],
+                'start_date': sprint.get('startDate'),
+                'end_date': sprint.get('endDate')
+            }
+            if sprint_metrics is None:
+                summary.append(dict(sprint_info, error=errors_by_sprint[sprint['id']]))
+            else:
+                summary.append(dict(sprint_metrics['summary'], **sprint_info))
         return jsonify(summary)
     except Exception as e:
         print(f"Error in metrics summary: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def load_comparative_sprints(sprint_ids, on_loaded=None, versions=None):
+    """
+    Métricas comparativas de los sprints pedidos, cargados en paralelo y en el
+    mismo orden. Devuelve los sprints que se pudieron cargar y los errores.
+    on_loaded(), si se indica, se llama al terminar cada sprint (progreso);
+    versions son las versiones de datos ya consultadas (ver data_versions).
+    """
+    sprints_data = []
+    errors = []
+    for sprint_id, sprint_metrics, error in iter_sprint_metrics(sprint_ids, versions=versions):
+        if sprint_metrics is None:
+            errors.append({'sprint_id': sprint_id, 'error': error})
+        else:
+            sprints_data.append(sprint_metrics['comprehensive'])
+        if on_loaded is not None:
+            on_loaded()
+    return sprints_data, errors
+
+SUMMARY_TITLE_ROWS = [["Métricas Comparativas - Resumen Ejecutivo"], [""]]
+
+def comparative_summary_rows(sprints_data, errors, insights, title=True):
+    """Filas del resumen ejecutivo de la comparativa (compartidas por XLSX y CSV)."""
+    if title:
+        yield from SUMMARY_TITLE_ROWS
+    yield ["Insights Clave:"]
+    for insight in insights:
+        yield [insight]
+    
+    yield [""]
+    yield ["Métricas por Sprint:"]
+    yield ["Sprint", "Story Points Completados", "Horas Totales", "Eficiencia (SP/Hora)", "Ratio Bugs/Total", "Ratio Support/Total", "Precisión Estimaciones"]
+    
+    for sprint in sprints_data:
+        efficiency = sprint['total_hours'] > 0 and (sprint['completed_points'] / sprint['total_hours']) or 0
+        bugs_ratio = calculate_bugs_ratio(sprint)
+        support_ratio = calculate_support_ratio(sprint)
+        estimation_accuracy = calculate_estimation_accuracy(sprint)
+        
+        yield [
+            sprint['name'],
+            sprint['completed_points'],
+            round(sprint['total_hours'], 1),
+            round(efficiency, 2),
+            f"{bugs_ratio:.1f}%",
+            f"{support_ratio:.1f}%",
+            f"{format_significant(estimation_accuracy, 2)}%"
+        ]
+    
+    if errors:
+        yield [""]
+        yield ["Sprints no incluidos (error al cargar):"]
+        for error in errors:
+            yield [error['sprint_id'], error['error']]
+
+def individual_metrics_rows(individual_data):
+    """Encabezado y filas de las métricas individuales agregadas."""
+    yield ["Desarrollador", "Story Points Completados", "Horas Trabajadas", "Eficiencia (SP/Hora)", "Tareas Completadas"]
+    for developer, metrics in individual_data.items():
+        efficiency = metrics['total_hours'] > 0 and (metrics['completed_points'] / metrics['total_hours']) or 0
+        yield [
+            developer,
+            metrics['completed_points'],
+            round(metrics['total_hours'], 1),
+            round(efficiency, 2),
+            metrics['completed_tasks']
+        ]
+
+def comparative_detailed_rows(sprints_data):
+    """Encabezado y una fila por issue de cada sprint, precedida por el nombre del sprint."""
+    yield ["Sprint"] + ANALYSIS_HEADERS
+    for sprint in sprints_data:
+        for issue in sprint['detailed_issues']:
+            yield [sprint['name']] + analysis_row(issue)
+
 @app.route('/api/metrics/comparative', methods=['POST'])
 def get_comparative_metrics():
     """
@@ -913,18 +524,13 @@ def get_comparative_metrics():
         if not sprint_ids or len(sprint_ids) > 10:
             return jsonify({'error': 'Se requieren entre 1 y 10 sprints'}), 400
         
-        sprints_data = []
-        
-        for sprint_id in sprint_ids:
-            sprint_details = get_sprint_details(sprint_id)
-            issues = get_issues_with_details(sprint_id)
-            
-            # Calcular métricas del sprint
-            sprint_metrics = calculate_comprehensive_sprint_metrics(sprint_details, issues)
-            sprints_data.append(sprint_metrics)
+        sprints_data, errors = load_comparative_sprints(sprint_ids)
+        if not sprints_data:
+            return jsonify({'error': 'No se pudo cargar ningún sprint', 'errors': errors}), 500
         
         return jsonify({
             'sprints': sprints_data,
+            'errors': errors,
             'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         })
         
@@ -932,6 +538,100 @@ def get_comparative_metrics():
         print(f"Error in comparative metrics: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/metrics/history/<int:board_id>')
+def get_board_history(board_id):
+    """
+    Tendencias de todos los sprints cerrados del tablero (sin el límite de 10
+    de la comparativa): velocidad, say/do, precisión de estimaciones y totales
+    por desarrollador. Acepta ?since=YYYY-MM-DD.
+    """
+    try:
+        since = request.args.get('since')
+        if since:
+            try:
+                datetime.strptime(since, '%Y-%m-%d')
+            except ValueError:
+                return jsonify({'error': 'since debe tener el formato YYYY-MM-DD'}), 400
+        return jsonify(build_board_history(board_id, since))
+    except Exception as e:
+        print(f"Error in board history: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def build_comparative_workbook(sprints_data, errors):
+    """Libro de la comparativa: resumen ejecutivo, métricas individuales y análisis detallado."""
+    insights = generate_executive_insights(sprints_data)
+    individual_data = aggregate_individual_metrics(sprints_data)
+    
+    wb = StreamingWorkbook()
+    wb.add_sheet("Resumen Ejecutivo", lambda: comparative_summary_rows(sprints_data, errors, insights))
+    wb.add_sheet("Métricas Individuales", lambda: individual_metrics_rows(individual_data))
+    wb.add_sheet("Análisis Detallado", lambda: comparative_detailed_rows(sprints_data))
+    return wb
+
+def comparative_xlsx_name():
+    return f"comparative_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+
+def comparative_export_task(sprint_ids):
+    """Trabajo de export_jobs que genera el XLSX de la comparativa informando el progreso."""
+    def run(job):
+        versions = data_versions(sprint_ids)
+        etag = export_etag('comparative.xlsx', sprint_ids, versions)
+        path = cached_path(etag)
+        if path is not None:
+            job.sprints_loaded = job.sprints_total
+            return path, etag
+        
+        sprints_data, errors = load_comparative_sprints(sprint_ids, on_loaded=job.sprint_loaded, versions=versions)
+        if not sprints_data:
+            raise Exception('No se pudo cargar ningún sprint')
+        wb = build_comparative_workbook(sprints_data, errors)
+        
+        def write(fileobj):
+            wb.save(fileobj, progress=job.rows_progress)
+        
+        if etag is not None and not errors:
+            return export_cache.save(etag, comparative_xlsx_name(), write), etag
+        return job.write_file(comparative_xlsx_name(), write), None
+    return run
+
+@app.route('/api/metrics/comparative/export_jobs', methods=['POST'])
+def submit_comparative_export():
+    """
+    Encola la generación del XLSX comparativo. Devuelve 202 con el id del
+    trabajo; el progreso se consulta en /api/export_jobs/<job_id>.
+    """
+    try:
+        sprint_ids = [int(sid) for sid in request.json.get('sprint_ids', [])]
+        if not sprint_ids:
+            return jsonify({'error': 'Se requieren IDs de sprints'}), 400
+        job = export_jobs.submit('comparative_xlsx', len(sprint_ids), comparative_export_task(sprint_ids))
+        return jsonify(job.to_dict()), 202
+    except export_jobs.QueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        print(f"Error submitting comparative export: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/export_jobs/<job_id>')
+def get_export_job(job_id):
+    job = export_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Exportación no encontrada o expirada'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/export_jobs/<job_id>/download')
+def download_export_job(job_id):
+    job = export_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Exportación no encontrada o expirada'}), 404
+    if job.state != 'done':
+        return jsonify({'error': 'La exportación todavía no terminó', 'state': job.state}), 409
+    if not os.path.exists(job.path):
+        return jsonify({'error': 'El archivo de la exportación ya no está disponible'}), 410
+    if job.etag is not None:
+        return export_cache.send(job.etag, job.path, XLSX_MIMETYPE)
+    return send_file(job.path, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=os.path.basename(job.path))
+
 @app.route('/api/metrics/comparative/download_xlsx')
 def download_comparative_analysis_xlsx():
     """
@@ -943,110 +643,18 @@ def download_comparative_analysis_xlsx():
             return jsonify({'error': 'Se requieren IDs de sprints'}), 400
         
         sprint_ids = [int(sid) for sid in sprint_ids]
-        
-        wb = Workbook()
-        
-        # Hoja de Resumen Ejecutivo
-        ws_summary = wb.active
-        ws_summary.title = "Resumen Ejecutivo"
-        ws_summary.append(["Métricas Comparativas - Resumen Ejecutivo"])
-        ws_summary.append([""])
+        versions = data_versions(sprint_ids)
+        etag = export_etag('comparative.xlsx', sprint_ids, versions)
+        cached = cached_response(etag, XLSX_MIMETYPE)
+        if cached is not None:
+            return cached
         
         # Obtener datos de todos los sprints
-        sprints_data = []
-        for sprint_id in sprint_ids:
-            sprint_details = get_sprint_details(sprint_id)
-            issues = get_issues_with_details(sprint_id)
-            sprint_metrics = calculate_comprehensive_sprint_metrics(sprint_details, issues)
-            sprints_data.append(sprint_metrics)
-        
-        # Generar insights
-        insights = generate_executive_insights(sprints_data)
-        ws_summary.append(["Insights Clave:"])
-        for insight in insights:
-            ws_summary.append([insight])
-        
-        ws_summary.append([""])
-        ws_summary.append(["Métricas por Sprint:"])
-        ws_summary.append(["Sprint", "Story Points Completados", "Horas Totales", "Eficiencia (SP/Hora)", "Ratio Bugs/Total", "Ratio Support/Total", "Precisión Estimaciones"])
-        
-        for sprint in sprints_data:
-            efficiency = sprint['total_hours'] > 0 and (sprint['completed_points'] / sprint['total_hours']) or 0
-            bugs_ratio = calculate_bugs_ratio(sprint)
-            support_ratio = calculate_support_ratio(sprint)
-            estimation_accuracy = calculate_estimation_accuracy(sprint)
-            
-            ws_summary.append([
-                sprint['name'],
-                sprint['completed_points'],
-                round(sprint['total_hours'], 1),
-                round(efficiency, 2),
-                f"{bugs_ratio:.1f}%",
-                f"{support_ratio:.1f}%",
-                f"{format_significant(estimation_accuracy, 2)}%"
-            ])
-        
-        # Hoja de Métricas Individuales
-        ws_individual = wb.create_sheet(title="Métricas Individuales")
-        ws_individual.append(["Desarrollador", "Story Points Completados", "Horas Trabajadas", "Eficiencia (SP/Hora)", "Tareas Completadas"])
-        
-        individual_data = aggregate_individual_metrics(sprints_data)
-        for developer, metrics in individual_data.items():
-            efficiency = metrics['total_hours'] > 0 and (metrics['completed_points'] / metrics['total_hours']) or 0
-            ws_individual.append([
-                developer,
-                metrics['completed_points'],
-                round(metrics['total_hours'], 1),
-                round(efficiency, 2),
-                metrics['completed_tasks']
-            ])
-        
-        # Hoja de Análisis Detallado
-        ws_detailed = wb.create_sheet(title="Análisis Detallado")
-        ws_detailed.append([
-            "Sprint", "Issue Type", "Issue Key", "Summary", "Assignee", "Status", 
-            "Time Spent", "Story Points", "Story Points vs Time", "Parent Summary", "Fecha de Creación"
-        ])
+        sprints_data, errors = load_comparative_sprints(sprint_ids, versions=versions)
+        wb = build_comparative_workbook(sprints_data, errors)
         
-        for sprint in sprints_data:
-            for issue in sprint['detailed_issues']:
-                ws_detailed.append([
-                    sprint['name'],
-                    issue['issue_type'],
-                    issue['issue_key'],
-                    issue['summary'],
-                    issue['assignee'],
-                    issue['status'],
-                    issue['time_spent'],
-                    issue['story_points'] if issue['story_points'] > 0 else None,
-                    issue['story_points_analysis'],
-                    issue['parent_summary'],
-                    issue['fecha_creacion']
-                ])
-        
-        # Ajustar ancho de columnas
-        for ws in [ws_summary, ws_individual, ws_detailed]:
-            for column in ws.columns:
-                max_length = 0
-                column = list(column)
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = (max_length + 2)
-                ws.column_dimensions[column[0].column_letter].width = adjusted_width
-        
-        file_stream = BytesIO()
-        wb.save(file_stream)
-        file_stream.seek(0)
-        
-        return send_file(
-            file_stream,
-            as_attachment=True,
-            download_name=f"comparative_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        )
+        # Con sprints que fallaron al cargar el archivo no se guarda: el próximo intento los reintenta
+        return send_workbook(wb, comparative_xlsx_name(), etag if not errors else None)
         
     except Exception as e:
         print(f"Error downloading comparative analysis: {str(e)}")
@@ -1063,280 +671,109 @@ def download_comparative_analysis_csv():
             return jsonify({'error': 'Se requieren IDs de sprints'}), 400
         
         sprint_ids = [int(sid) for sid in sprint_ids]
-        
-        # Obtener datos de todos los sprints
-        sprints_data = []
-        for sprint_id in sprint_ids:
-            sprint_details = get_sprint_details(sprint_id)
-            issues = get_issues_with_details(sprint_id)
-            sprint_metrics = calculate_comprehensive_sprint_metrics(sprint_details, issues)
-            sprints_data.append(sprint_metrics)
+        versions = data_versions(sprint_ids)
+        etag = export_etag('comparative.csv', sprint_ids, versions)
+        cached = cached_response(etag, 'text/csv')
+        if cached is not None:
+            return cached
+        load_errors = []
         
         def generate_csv():
-            output = []
-            
-            # Resumen ejecutivo
-            output.append(["Métricas Comparativas - Resumen Ejecutivo"])
-            output.append([""])
+            # El título sale antes de cargar los sprints: el cliente (y un proxy intermedio)
+            # reciben los primeros bytes enseguida aunque la descarga de Jira tarde
+            yield from SUMMARY_TITLE_ROWS
             
+            # Obtener datos de todos los sprints
+            sprints_data, errors = load_comparative_sprints(sprint_ids, versions=versions)
+            load_errors.extend(errors)
             insights = generate_executive_insights(sprints_data)
-            output.append(["Insights Clave:"])
-            for insight in insights:
-                output.append([insight])
-            
-            output.append([""])
-            output.append(["Métricas por Sprint:"])
-            output.append(["Sprint", "Story Points Completados", "Horas Totales", "Eficiencia (SP/Hora)", "Ratio Bugs/Total", "Ratio Support/Total", "Precisión Estimaciones"])
+            yield from comparative_summary_rows(sprints_data, errors, insights, title=False)
             
-            for sprint in sprints_data:
-                efficiency = sprint['total_hours'] > 0 and (sprint['completed_points'] / sprint['total_hours']) or 0
-                bugs_ratio = calculate_bugs_ratio(sprint)
-                support_ratio = calculate_support_ratio(sprint)
-                estimation_accuracy = calculate_estimation_accuracy(sprint)
-                
-                output.append([
-                    sprint['name'],
-                    sprint['completed_points'],
-                    round(sprint['total_hours'], 1),
-                    round(efficiency, 2),
-                    f"{bugs_ratio:.1f}%",
-                    f"{support_ratio:.1f}%",
-                    f"{format_significant(estimation_accuracy, 2)}%"
-                ])
+            yield [""]
+            yield ["Métricas Individuales:"]
+            yield from individual_metrics_rows(aggregate_individual_metrics(sprints_data))
             
-            output.append([""])
-            output.append(["Métricas Individuales:"])
-            output.append(["Desarrollador", "Story Points Completados", "Horas Trabajadas", "Eficiencia (SP/Hora)", "Tareas Completadas"])
-            
-            individual_data = aggregate_individual_metrics(sprints_data)
-            for developer, metrics in individual_data.items():
-                efficiency = metrics['total_hours'] > 0 and (metrics['completed_points'] / metrics['total_hours']) or 0
-                output.append([
-                    developer,
-                    metrics['completed_points'],
-                    round(metrics['total_hours'], 1),
-                    round(efficiency, 2),
-                    metrics['completed_tasks']
-                ])
-            
-            output.append([""])
-            output.append(["Análisis Detallado:"])
-            output.append([
-                "Sprint", "Issue Type", "Issue Key", "Summary", "Assignee", "Status", 
-                "Time Spent", "Story Points", "Story Points vs Time", "Parent Summary", "Fecha de Creación"
-            ])
-            
-            for sprint in sprints_data:
-                for issue in sprint['detailed_issues']:
-                    output.append([
-                        sprint['name'],
-                        issue['issue_type'],
-                        issue['issue_key'],
-                        issue['summary'],
-                        issue['assignee'],
-                        issue['status'],
-                        issue['time_spent'],
-                        issue['story_points'] if issue['story_points'] > 0 else None,
-                        issue['story_points_analysis'],
-                        issue['parent_summary'],
-                        issue['fecha_creacion']
-                    ])
-            
-            # Escribir CSV en memoria
-            si = io.StringIO()
-            writer = csv.writer(si)
-            for row in output:
-                writer.writerow(row)
-            return si.getvalue()
-        
-        csv_data = generate_csv()
-        return Response(
-            csv_data,
-            mimetype='text/csv',
-            headers={
-                'Content-Disposition': f'attachment;filename=comparative_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-            }
+            yield [""]
+            yield ["Análisis Detallado:"]
+            yield from comparative_detailed_rows(sprints_data)
+        
+        return stream_and_store(
+            etag,
+            f'comparative_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+            'text/csv',
+            iter_csv(generate_csv()),
+            cacheable=lambda: not load_errors
         )
         
     except Exception as e:
         print(f"Error downloading comparative analysis CSV: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-def calculate_comprehensive_sprint_metrics(sprint_details, issues):
+def load_worklog_batches(sprint_ids, versions=None):
     """
-    Calcula métricas comprehensivas para un sprint
+    Worklogs de cada sprint como lote columnar, cargando solo sus issues (sin
+    calcular métricas). Los issues se descartan apenas se arma el lote; un
+    sprint que falla se omite y se informa en los errores.
     """
-    # Obtener fecha de fin del sprint
-    sprint_end = sprint_details.get('endDate')
-    sprint_end_dt = None
-    if sprint_end:
-        sprint_end_date = datetime.strptime(sprint_end, '%Y-%m-%d %H:%M:%S').date()
-        sprint_end_dt = datetime.combine(sprint_end_date, datetime.max.time().replace(hour=23, minute=59, second=59, microsecond=0))
-    
-    # Métricas básicas
-    completed_points = 0
-    estimated_points = 0  # Puntos estimados totales del sprint
-    total_hours = 0
-    issue_type_distribution = {}
-    individual_metrics = {}
-    detailed_issues = []
-    estimation_analysis = []
-    # Distribución por tipo SOLO de issues finalizadas al cierre del sprint
-    completed_issue_type_distribution = {}
-    
-    for issue in issues:
-        issue_type = issue['fields']['issuetype']['name']
-        issue_key = issue['key']
-        summary = issue['fields'].get('summary', '')
-        
-        # Assignee
-        assignee = ''
-        if issue['fields'].get('assignee'):
-            assignee = issue['fields']['assignee'].get('displayName', '')
-        
-        # Estado al final del sprint usando changelog
-        status = issue['fields']['status']['name']
-        status_at_sprint_end = status
-        # Determinar el tipo de issue al final del sprint usando el changelog
-        issue_type_at_sprint_end = issue_type
-        changelog = issue.get('changelog', {}).get('histories', [])
-        
-        if sprint_end_dt:
-            sorted_changelog = sorted(changelog, key=lambda x: x.get('created', ''))
-            initial_status = None
-            last_status_before_sprint_end = None
-            last_type_before_sprint_end = None
-            type_set_from_future_change = False
-            
-            for history in sorted_changelog:
-                change_date = history.get('created')
-                if change_date:
-                    try:
-                        change_dt = datetime.strptime(change_date.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                        
-                        for item in history.get('items', []):
-                            if item.get('field') == 'status':
-                                if initial_status is None:
-                                    initial_status = item.get('fromString')
-                                
-                                if change_dt <= sprint_end_dt:
-                                    last_status_before_sprint_end = item.get('toString')
-                            if item.get('field') == 'issuetype':
-                                # Si el cambio ocurrió antes o en la fecha fin del sprint,
-                                # el tipo vigente pasa a ser el destino del cambio.
-                                if change_dt <= sprint_end_dt:
-                                    last_type_before_sprint_end = item.get('toString')
-                                else:
-                                    # Si el primer cambio de tipo ocurre DESPUÉS del fin del sprint,
-                                    # entonces el tipo vigente al finalizar el sprint era el "from".
-                                    if not last_type_before_sprint_end and not type_set_from_future_change:
-                                        issue_type_at_sprint_end = item.get('fromString') or issue_type
-                                        type_set_from_future_change = True
-                    except Exception:
-                        pass
-            
-            if last_status_before_sprint_end:
-                status_at_sprint_end = last_status_before_sprint_end
-            elif initial_status:
-                status_at_sprint_end = initial_status
-            else:
-                status_at_sprint_end = status
-            
-            if last_type_before_sprint_end:
-                issue_type_at_sprint_end = last_type_before_sprint_end
-        
-        # Time spent - worklogs ya están filtrados por sprint en get_issues_with_details
-        time_spent = sum(worklog['timeSpentHours'] for worklog in issue['worklogs'])
-        total_hours += time_spent
-        
-        # Story points
-        story_points = float(issue['fields'].get('story_points', 0) or 0)
-        
-        # Contar puntos estimados totales (solo para Task y Story, excluyendo Support, Bug y Spike)
-        if issue_type in ['Task', 'Story'] and story_points > 0:
-            estimated_points += story_points
-        
-        # Solo contar story points y distribuir si está en estado final
-        if status_at_sprint_end in ['Done', 'For Release', 'CODE REVIEW']:
-            completed_points += story_points
-            # Contabilizar issues completadas por tipo (al cierre del sprint)
-            if issue_type_at_sprint_end not in completed_issue_type_distribution:
-                completed_issue_type_distribution[issue_type_at_sprint_end] = 0
-            completed_issue_type_distribution[issue_type_at_sprint_end] += 1
-        
-        # Distribución por tipo (usando el tipo vigente al final del sprint)
-        if issue_type_at_sprint_end not in issue_type_distribution:
-            issue_type_distribution[issue_type_at_sprint_end] = 0
-        issue_type_distribution[issue_type_at_sprint_end] += 1
-        
-        # Métricas individuales
-        if assignee:
-            if assignee not in individual_metrics:
-                individual_metrics[assignee] = {
-                    'developer': assignee,
-                    'completed_points': 0,
-                    'total_hours': 0,
-                    'completed_tasks': 0
-                }
-            
-            individual_metrics[assignee]['total_hours'] += time_spent
-            if status_at_sprint_end in ['Done', 'For Release', 'CODE REVIEW']:
-                individual_metrics[assignee]['completed_points'] += story_points
-                individual_metrics[assignee]['completed_tasks'] += 1
+    versions = versions or {}
+    batches = []
+    errors = []
+    for sprint_id in sprint_ids:
+        try:
+            issues = get_sprint_issues(sprint_id, data_version=versions.get(sprint_id))
+            rows = columnar_export.worklog_rows(sprint_id, get_sprint_name(sprint_id), issues)
+        except Exception as e:
+            print(f"Error loading sprint {sprint_id}: {str(e)}")
+            errors.append({'sprint_id': sprint_id, 'error': str(e)})
+            continue
+        batches.append(columnar_export.to_batch('worklogs', rows))
+    return batches, errors
+
+@app.route('/api/metrics/comparative/download_columnar')
+def download_comparative_columnar():
+    """
+    Issues o worklogs de varios sprints en un solo archivo Parquet / Arrow,
+    un lote por sprint. Los sprints que no se pudieron cargar se omiten y se
+    listan en los metadatos del archivo (clave `errors`).
+    """
+    try:
+        sprint_ids = request.args.get('sprint_ids', '').split(',')
+        if not sprint_ids or sprint_ids[0] == '':
+            return jsonify({'error': 'Se requieren IDs de sprints'}), 400
         
-        # Análisis de estimaciones
-        if status_at_sprint_end in ['CODE REVIEW', 'For Release', 'Done']:
-            analysis = analyze_story_points_vs_time(story_points, time_spent)
-            estimation_analysis.append({
-                'issue_key': issue_key,
-                'story_points': story_points,
-                'time_spent': time_spent,
-                'analysis': analysis
-            })
+        sprint_ids = [int(sid) for sid in sprint_ids]
+        table, fmt, error = columnar_args()
+        if error is not None:
+            return error
+        extension, mimetype = columnar_export.FORMATS[fmt]
+        versions = data_versions(sprint_ids)
+        etag = export_etag(f'comparative_{table}.{extension}', sprint_ids, versions)
+        cached = cached_response(etag, mimetype)
+        if cached is not None:
+            return cached
+        
+        if table == 'issues':
+            sprints_data, errors = load_comparative_sprints(sprint_ids, versions=versions)
+            batches = (
+                columnar_export.issue_rows(sprint['id'], sprint['name'], sprint['detailed_issues'])
+                for sprint in sprints_data
+            )
+        else:
+            batches, errors = load_worklog_batches(sprint_ids, versions)
         
-        # Parent summary
-        parent_summary = ""
-        if issue['fields'].get('parent'):
-            parent_fields = issue['fields']['parent'].get('fields', {})
-            parent_summary = parent_fields.get('summary', '')
+        def write(fileobj):
+            columnar_export.write(fileobj, table, fmt, batches, metadata={'errors': errors})
         
-        # Fecha de creación
-        fecha_creacion = issue['fields'].get('created', '')
-        if fecha_creacion:
-            try:
-                fecha_dt = datetime.strptime(fecha_creacion.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                fecha_creacion = fecha_dt.strftime('%Y-%m-%d %H:%M:%S')
-            except:
-                pass
+        return export_cache.send_export(
+            etag if not errors else None,
+            f"comparative_{table}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+            mimetype,
+            write
+        )
         
-        # Detalles de la issue para el reporte
-        detailed_issues.append({
-            'issue_type': issue_type,
-            'issue_key': issue_key,
-            'summary': summary,
-            'assignee': assignee,
-            'status': status_at_sprint_end,
-            'time_spent': time_spent,
-            'story_points': story_points,
-            'story_points_analysis': analyze_story_points_vs_time(story_points, time_spent) if status_at_sprint_end in ['CODE REVIEW', 'For Release', 'Done'] else "",
-            'parent_summary': parent_summary,
-            'fecha_creacion': fecha_creacion
-        })
-    
-    return {
-        'id': sprint_details['id'],
-        'name': sprint_details['name'],
-        'start_date': sprint_details.get('startDate'),
-        'end_date': sprint_details.get('endDate'),
-        'completed_points': completed_points,
-        'estimated_points': estimated_points,  # Puntos estimados totales
-        'total_hours': total_hours,
-        'issue_type_distribution': issue_type_distribution,
-        'completed_issue_type_distribution': completed_issue_type_distribution,
-        'individual_metrics': list(individual_metrics.values()),
-        'detailed_issues': detailed_issues,
-        'estimation_analysis': estimation_analysis
-    }
+    except Exception as e:
+        print(f"Error downloading comparative columnar export: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
 def generate_executive_insights(sprints_data):
     """
@@ -1431,44 +868,28 @@ def aggregate_individual_metrics(sprints_data):
     """
     Agrega métricas individuales de todos los sprints
     """
-    aggregated = {}
-    
-    for sprint in sprints_data:
-        # individual_metrics es una lista de diccionarios con los datos
-        # pero necesitamos reconstruir el mapeo de desarrollador -> métricas
-        # Vamos a usar los detailed_issues para reconstruir esto
-        developer_metrics = {}
-        
-        for issue in sprint['detailed_issues']:
-            assignee = issue['assignee']
-            if assignee:
-                if assignee not in developer_metrics:
-                    developer_metrics[assignee] = {
-                        'completed_points': 0,
-                        'total_hours': 0,
-                        'completed_tasks': 0
-                    }
-                
-                developer_metrics[assignee]['total_hours'] += issue['time_spent']
-                
-                if issue['status'] in ['Done', 'For Release', 'CODE REVIEW']:
-                    developer_metrics[assignee]['completed_points'] += issue['story_points']
-                    developer_metrics[assignee]['completed_tasks'] += 1
-        
-        # Agregar al total agregado
-        for developer, metrics in developer_metrics.items():
-            if developer not in aggregated:
-                aggregated[developer] = {
-                    'completed_points': 0,
-                    'total_hours': 0,
-                    'completed_tasks': 0
-                }
-            
-            aggregated[developer]['completed_points'] += metrics['completed_points']
-            aggregated[developer]['total_hours'] += metrics['total_hours']
-            aggregated[developer]['completed_tasks'] += metrics['completed_tasks']
-    
-    return aggregated
+    # Reconstruir el mapeo desarrollador -> métricas a partir de los detailed_issues
+    # de todos los sprints, como columnas para agrupar de forma vectorizada
+    rows = [issue for sprint in sprints_data for issue in sprint['detailed_issues'] if issue['assignee']]
+    if not rows:
+        return {}
+    
+    assignee = Categorical([issue['assignee'] for issue in rows])
+    hours = np.fromiter((issue['time_spent'] for issue in rows), dtype=float, count=len(rows))
+    points = np.fromiter((issue['story_points'] for issue in rows), dtype=float, count=len(rows))
+    completed = Categorical([issue['status'] for issue in rows]).isin(COMPLETED_AT_CLOSE)
+    
+    hours_by_dev = group_sum(assignee, hours)
+    points_by_dev = group_sum(assignee, points, completed)
+    tasks_by_dev = group_count(assignee, completed)
+    return {
+        developer: {
+            'completed_points': points_by_dev.get(developer, 0),
+            'total_hours': total,
+            'completed_tasks': tasks_by_dev.get(developer, 0)
+        }
+        for developer, total in hours_by_dev.items()
+    }
 
 if __name__ == '__main__':
     app.run(debug=True)
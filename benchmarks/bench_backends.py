@@ -0,0 +1,52 @@
+"""
+Compara los backends 'sync' y 'async' de jira_api contra un Jira falso local.
+
+Uso (desde la raíz del proyecto, con config.py presente):
+    python benchmarks/bench_backends.py --issues 500 --latency 0.02
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jira_api
+import jira_api_async
+from fake_jira import FakeJira
+
+def bench(backend, sprint_id):
+    jira_api.JIRA_BACKEND = backend
+    start = time.perf_counter()
+    issues = jira_api.get_issues_in_sprint(sprint_id)
+    worklogs = jira_api.get_worklogs_for_issues([issue['id'] for issue in issues])
+    elapsed = time.perf_counter() - start
+    return elapsed, len(issues), sum(len(w) for w in worklogs.values())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=500)
+    parser.add_argument('--worklogs', type=int, default=25, help='worklogs por issue (>20 fuerza el endpoint)')
+    parser.add_argument('--latency', type=float, default=0.02, help='latencia por petición en segundos')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    fake = FakeJira(issues=args.issues, worklogs_per_issue=args.worklogs, latency=args.latency).start()
+    jira_api.URL = fake.url
+    # El benchmark mide el cliente, no el limitador de tasa
+    jira_api.rate_limiter.rate = jira_api.rate_limiter.capacity = 1e9
+
+    try:
+        for backend in ('sync', 'async'):
+            times = []
+            for _ in range(args.rounds):
+                elapsed, issues, worklogs = bench(backend, 1)
+                times.append(elapsed)
+            print(f"{backend:>5}: mejor {min(times):.3f}s  media {sum(times) / len(times):.3f}s  "
+                  f"({issues} issues, {worklogs} worklogs, workers={jira_api.JIRA_MAX_WORKERS})")
+    finally:
+        jira_api_async.close()
+        fake.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Microbenchmark del parseo de fechas de Jira: strptime + astimezone (versión
+anterior) frente a jira_dates (fromisoformat con caché y comparación epoch).
+
+Uso (desde la raíz del proyecto, con config.py presente):
+    python benchmarks/bench_dates.py --worklogs 20000
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+
+import jira_dates
+from config import TIMEZONE
+
+def make_timestamps(count, distinct):
+    base = datetime(2024, 1, 1, 9, 0, 0)
+    values = [
+        (base + timedelta(minutes=random.randint(0, 60 * 24 * 14))).strftime('%Y-%m-%dT%H:%M:%S.000-0300')
+        for _ in range(distinct)
+    ]
+    return [random.choice(values) for _ in range(count)]
+
+def filter_old(values, start, end):
+    result = 0
+    for value in values:
+        date = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').astimezone(start.tzinfo)
+        if start <= date <= end:
+            result += 1
+    return result
+
+def filter_new(values, start, end):
+    start_ts, end_ts = start.timestamp(), end.timestamp()
+    return sum(1 for value in values if start_ts <= jira_dates.parse_jira_epoch(value) <= end_ts)
+
+def format_old(values):
+    for value in values:
+        tz = pytz.timezone(TIMEZONE)
+        datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').astimezone(tz).strftime('%Y-%m-%d %H:%M:%S')
+
+def format_new(values):
+    for value in values:
+        jira_dates.to_configured_tz(value).strftime('%Y-%m-%d %H:%M:%S')
+
+def local_old(values):
+    for value in values:
+        datetime.strptime(value.split('.')[0], '%Y-%m-%dT%H:%M:%S')
+
+def local_new(values):
+    for value in values:
+        jira_dates.parse_jira_local(value)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--worklogs', type=int, default=20000)
+    parser.add_argument('--distinct', type=int, default=5000, help='fechas distintas entre los worklogs')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    values = make_timestamps(args.worklogs, args.distinct)
+    tz = jira_dates.get_timezone()
+    start = tz.localize(datetime(2024, 1, 3))
+    end = tz.localize(datetime(2024, 1, 10, 23, 59, 59))
+    assert filter_old(values, start, end) == filter_new(values, start, end)
+
+    cases = [
+        ('filter_worklogs_by_sprint', lambda: filter_old(values, start, end), lambda: filter_new(values, start, end)),
+        ('format_date_to_utc3', lambda: format_old(values), lambda: format_new(values)),
+        ('changelog (hora local)', lambda: local_old(values), lambda: local_new(values)),
+    ]
+    for name, old, new in cases:
+        # Primera pasada en frío (sin caché) y luego las repeticiones
+        jira_dates.parse_jira_datetime.cache_clear()
+        jira_dates.parse_jira_local.cache_clear()
+        cold = timeit.timeit(new, number=1)
+        old_time = min(timeit.repeat(old, number=1, repeat=args.repeat))
+        new_time = min(timeit.repeat(new, number=1, repeat=args.repeat))
+        print(f"{name:<28} antes {old_time * 1000:8.1f} ms   ahora {new_time * 1000:8.1f} ms "
+              f"(en frío {cold * 1000:.1f} ms)   x{old_time / new_time:.1f}")
+
+if __name__ == '__main__':
+    main()
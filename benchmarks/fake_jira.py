@@ -0,0 +1,100 @@
+"""
+Servidor HTTP local que imita los endpoints de Jira usados por jira_api,
+con latencia artificial por petición. Solo para benchmarks.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+def _worklog(issue_id, n):
+    return {
+        'id': f"{issue_id}{n:03d}",
+        'issueId': str(issue_id),
+        'author': {'displayName': f"dev{n % 5}", 'avatarUrls': {'48x48': ''}},
+        'started': '2024-01-03T10:00:00.000-0300',
+        'updated': '2024-01-03T10:00:00.000-0300',
+        'timeSpent': '1h 30m',
+    }
+
+def _issue(n, worklogs_per_issue):
+    issue_id = 10000 + n
+    return {
+        'id': str(issue_id),
+        'key': f"FAKE-{n}",
+        'fields': {
+            'summary': f"Issue {n}",
+            'issuetype': {'name': 'Story', 'iconUrl': ''},
+            'status': {'name': 'Done'},
+            'created': '2024-01-01T10:00:00.000-0300',
+            'updated': '2024-01-05T10:00:00.000-0300',
+            'customfield_10016': 3,
+            'worklog': {'startAt': 0, 'maxResults': 20, 'total': worklogs_per_issue, 'worklogs': []},
+        },
+        'changelog': {'startAt': 0, 'maxResults': 0, 'total': 0, 'histories': []},
+    }
+
+class FakeJira:
+    def __init__(self, issues=500, worklogs_per_issue=25, latency=0.02, page_size=100):
+        self.latency = latency
+        self.page_size = page_size
+        self.worklogs_per_issue = worklogs_per_issue
+        self.issues = [_issue(n, worklogs_per_issue) for n in range(issues)]
+        self.requests = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                fake.requests += 1
+                time.sleep(fake.latency)
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                body = fake.route(parsed.path, query)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def route(self, path, query):
+        match = re.match(r'/rest/agile/1.0/sprint/(\d+)/issue$', path)
+        if match:
+            start = int(query.get('startAt', 0))
+            size = min(int(query.get('maxResults', 50)), self.page_size)
+            return {'startAt': start, 'maxResults': size, 'total': len(self.issues),
+                    'issues': self.issues[start:start + size]}
+        match = re.match(r'/rest/api/3/issue/(\d+)/worklog$', path)
+        if match:
+            worklogs = [_worklog(match.group(1), n) for n in range(self.worklogs_per_issue)]
+            return {'startAt': 0, 'maxResults': 5000, 'total': len(worklogs), 'worklogs': worklogs}
+        return None
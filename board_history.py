@@ -0,0 +1,102 @@
+"""
+Historial de un tablero: tendencias sobre todos sus sprints cerrados.
+
+A diferencia de la comparativa (hasta 10 sprints con el detalle por issue),
+aquí cada sprint se pliega en acumuladores en cuanto se carga y su detalle se
+descarta, así que la memoria no crece con la cantidad de sprints: solo se
+conserva una fila de resumen por sprint y los totales por desarrollador.
+"""
+from datetime import datetime
+
+from jira_api import get_sprints_for_board
+from sprint_metrics import iter_sprint_metrics
+
+class BoardHistory:
+    """Acumula velocidad, say/do, precisión de estimaciones y totales por desarrollador."""
+
+    def __init__(self):
+        self.sprints = []
+        self.errors = []
+        self.developers = {}
+        self.completed_points = 0
+        self.committed_points = 0
+        self.completed_committed_points = 0
+        self.total_hours = 0
+        self.estimations = 0
+        self.correct_estimations = 0
+
+    def add(self, sprint, metrics):
+        summary = metrics['summary']
+        comprehensive = metrics['comprehensive']
+        estimations = comprehensive['estimation_analysis']
+        correct = sum(1 for estimation in estimations if estimation['analysis'] == 'Correcto')
+
+        self.sprints.append({
+            'id': sprint['id'],
+            'name': sprint['name'],
+            'start_date': sprint.get('startDate'),
+            'end_date': sprint.get('endDate'),
+            'completed_points': comprehensive['completed_points'],
+            'estimated_points': comprehensive['estimated_points'],
+            'total_hours': comprehensive['total_hours'],
+            'committed_points': summary['committed_points'],
+            'say_do_ratio': summary['say_do_ratio'],
+            'estimation_accuracy': (correct / len(estimations) * 100) if estimations else 0
+        })
+        self.completed_points += comprehensive['completed_points']
+        self.total_hours += comprehensive['total_hours']
+        self.committed_points += summary['committed_points']
+        self.completed_committed_points += summary['completed_points']
+        self.estimations += len(estimations)
+        self.correct_estimations += correct
+
+        for developer in comprehensive['individual_metrics']:
+            totals = self.developers.setdefault(developer['developer'], {
+                'completed_points': 0,
+                'total_hours': 0,
+                'completed_tasks': 0,
+                'sprints': 0
+            })
+            totals['completed_points'] += developer['completed_points']
+            totals['total_hours'] += developer['total_hours']
+            totals['completed_tasks'] += developer['completed_tasks']
+            totals['sprints'] += 1
+
+    def add_error(self, sprint, error):
+        self.errors.append({'sprint_id': sprint['id'], 'sprint_name': sprint['name'], 'error': error})
+
+    def result(self):
+        loaded = len(self.sprints)
+        return {
+            'sprints': self.sprints,
+            'totals': {
+                'sprints': loaded,
+                'completed_points': self.completed_points,
+                'total_hours': self.total_hours,
+                'average_velocity': self.completed_points / loaded if loaded else 0,
+                'say_do_ratio': (self.completed_committed_points / self.committed_points * 100) if self.committed_points > 0 else 0,
+                'estimation_accuracy': (self.correct_estimations / self.estimations * 100) if self.estimations else 0
+            },
+            'developers': self.developers,
+            'errors': self.errors
+        }
+
+def build_board_history(board_id, since=None):
+    """
+    Recorre en orden cronológico los sprints cerrados del tablero (opcionalmente
+    los iniciados desde `since`, 'YYYY-MM-DD') y devuelve sus tendencias.
+    """
+    sprints = [s for s in get_sprints_for_board(board_id) if s['state'].upper() == 'CLOSED']
+    if since:
+        sprints = [s for s in sprints if (s.get('startDate') or '')[:10] >= since]
+    sprints.sort(key=lambda x: x['startDate'] if x.get('startDate') else '')
+    sprints_by_id = {sprint['id']: sprint for sprint in sprints}
+
+    history = BoardHistory()
+    # Sin memoizar: recorrer un año de sprints no debe desalojar las métricas de uso interactivo
+    for sprint_id, metrics, error in iter_sprint_metrics(list(sprints_by_id), memoize=False):
+        if metrics is None:
+            history.add_error(sprints_by_id[sprint_id], error)
+        else:
+            history.add(sprints_by_id[sprint_id], metrics)
+    return dict(history.result(), board_id=board_id, analysis_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
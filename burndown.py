@@ -0,0 +1,143 @@
+"""
+Motor de burndown basado en el changelog de cada issue.
+
+En una sola pasada por issue se generan los eventos que mueven la línea
+(completado, reabierto, agregado o quitado del sprint) y se acumulan por día;
+luego las series ideal, real y de alcance se arman recorriendo los días una
+vez. Coste O(issues + transiciones + días) en lugar de O(días × issues).
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from issue_timeline import get_timeline
+from jira_dates import to_configured_tz
+
+COMPLETED_STATUSES = {'DONE', 'FOR RELEASE'}
+
+_STATUS = 0
+_SPRINT = 1
+
+def _is_completed(status):
+    return (status or '').upper() in COMPLETED_STATUSES
+
+def _sprint_datetime(value):
+    """Fecha de sprint como hora local naive: acepta la fecha cruda de Jira o la ya formateada."""
+    if 'T' in value:
+        return to_configured_tz(value).replace(tzinfo=None)
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+def _issue_events(issue, timeline, sprint_id, start, window_end):
+    """
+    Estado inicial del issue al comenzar el sprint (miembro, completado) y sus
+    eventos dentro de la ventana (start, window_end], ordenados por fecha.
+    """
+    events = []
+    sprint_id = str(sprint_id)
+
+    if len(timeline.status):
+        done = _is_completed(timeline.status_at(start))
+        for when, _, to_value in zip(timeline.status.times, timeline.status.from_values, timeline.status.to_values):
+            if start < when <= window_end:
+                events.append((when, _STATUS, _is_completed(to_value)))
+    else:
+        # Sin changelog de estado: se usa la fecha de resolución de los completados
+        resolved = issue.resolved if _is_completed(timeline.current_status) else None
+        done = resolved is not None and resolved <= start
+        if resolved is not None and start < resolved <= window_end:
+            events.append((resolved, _STATUS, True))
+
+    member = timeline.in_sprint_at(sprint_id, start)
+    if len(timeline.sprints):
+        for when, from_ids, to_ids in zip(timeline.sprints.times, timeline.sprints.from_values, timeline.sprints.to_values):
+            if start < when <= window_end and (sprint_id in from_ids) != (sprint_id in to_ids):
+                events.append((when, _SPRINT, sprint_id in to_ids))
+    elif not member and timeline.created is not None and timeline.created <= window_end:
+        # Creado directamente dentro del sprint ya iniciado
+        events.append((timeline.created, _SPRINT, True))
+
+    events.sort(key=lambda event: event[0])
+    return member, done, events
+
+def build_burndown(sprint, issues, now=None):
+    """
+    Calcula el burndown del sprint: línea ideal (desde el alcance inicial),
+    línea real hasta hoy (o el fin del sprint), línea de alcance y los cambios
+    de alcance (issues agregados o quitados una vez iniciado el sprint).
+    """
+    start = _sprint_datetime(sprint['startDate'])
+    end_day = _sprint_datetime(sprint['endDate']).date()
+    end = datetime.combine(end_day, time(23, 59, 59))
+    now = now or datetime.now()
+    window_end = min(now, end)
+    start_day = start.date()
+    total_days = max((end_day - start_day).days + 1, 1)
+
+    initial_scope = 0
+    initial_remaining = 0
+    remaining_delta = defaultdict(float)
+    scope_delta = defaultdict(float)
+    scope_changes = {'added': 0, 'removed': 0, 'added_points': 0, 'removed_points': 0}
+
+    for issue in issues:
+        points = issue.story_points
+        in_sprint, done, events = _issue_events(issue, get_timeline(issue), sprint['id'], start, window_end)
+        if in_sprint:
+            initial_scope += points
+            if not done:
+                initial_remaining += points
+
+        for when, kind, value in events:
+            day = when.date()
+            if kind == _STATUS:
+                if in_sprint and value != done:
+                    remaining_delta[day] += -points if value else points
+                done = value
+            elif value != in_sprint:
+                in_sprint = value
+                sign = 1 if value else -1
+                if value:
+                    scope_changes['added'] += 1
+                    scope_changes['added_points'] += points
+                else:
+                    scope_changes['removed'] += 1
+                    scope_changes['removed_points'] += points
+                scope_delta[day] += sign * points
+                if not done:
+                    remaining_delta[day] += sign * points
+
+    # Línea ideal a partir del alcance comprometido al inicio
+    points_per_day = initial_scope / total_days
+    ideal_burn = [
+        {
+            'date': (start_day + timedelta(days=day)).strftime('%Y-%m-%d'),
+            'points': round(initial_scope - (points_per_day * day), 1)
+        }
+        for day in range(total_days)
+    ]
+
+    # Líneas real y de alcance, acumulando los deltas de cada día
+    actual_burn = []
+    scope_line = []
+    remaining = initial_remaining
+    scope = initial_scope
+    current_day = start_day
+    last_day = min(now.date(), end_day)
+    while current_day <= last_day:
+        remaining += remaining_delta.get(current_day, 0)
+        scope += scope_delta.get(current_day, 0)
+        actual_burn.append({'date': current_day.strftime('%Y-%m-%d'), 'points': round(remaining, 1)})
+        scope_line.append({'date': current_day.strftime('%Y-%m-%d'), 'points': round(scope, 1)})
+        current_day += timedelta(days=1)
+
+    # Totales al momento actual (incluye eventos de días no recorridos, si los hay)
+    final_remaining = initial_remaining + sum(remaining_delta.values())
+    final_scope = initial_scope + sum(scope_delta.values())
+
+    return {
+        'ideal': ideal_burn,
+        'actual': actual_burn,
+        'scope': scope_line,
+        'total_points': round(final_scope, 1),
+        'remaining_points': round(final_remaining, 1),
+        'scope_changes': scope_changes
+    }
@@ -0,0 +1,142 @@
+"""
+Exportación columnar (Parquet o Arrow IPC) de los issues y worklogs de sprints.
+
+Las mismas filas que el análisis detallado (detailed_issues) y la descarga de
+worklogs, pero con tipos: enteros, decimales y fechas como timestamp en lugar
+de texto, columnas comprimidas con zstd y una fila por issue o worklog de
+todos los sprints pedidos. Pensado para cargar historiales de varios sprints
+con pandas.read_parquet / pyarrow sin parsear XLSX.
+
+Se escribe un lote por sprint: con filas generadas a medida, en memoria nunca
+hay más que las columnas de un sprint. Los lotes pueden venir también ya
+convertidos con to_batch (columnas Arrow, compactas), p. ej. cuando hay que
+cargar todos los sprints antes de escribir para conocer los que fallaron.
+Requiere el paquete pyarrow (dependencia opcional).
+"""
+import json
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependencia opcional
+    pa = None
+    pq = None
+
+from jira_dates import parse_jira_local
+
+# formato -> (extensión, mimetype)
+FORMATS = {
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+TABLES = ('issues', 'worklogs')
+COMPRESSION = 'zstd'
+
+ISSUE_COLUMNS = [
+    ('sprint_id', 'int64'),
+    ('sprint_name', 'string'),
+    ('issue_key', 'string'),
+    ('issue_type', 'string'),
+    ('summary', 'string'),
+    ('assignee', 'string'),
+    ('status', 'string'),  # estado al cierre del sprint
+    ('time_spent', 'float64'),  # worklogs ya filtrados por sprint
+    ('story_points', 'float64'),
+    ('story_points_analysis', 'string'),
+    ('parent_summary', 'string'),
+    ('created', 'timestamp'),
+]
+
+WORKLOG_COLUMNS = [
+    ('sprint_id', 'int64'),
+    ('sprint_name', 'string'),
+    ('issue_key', 'string'),
+    ('issue_type', 'string'),
+    ('summary', 'string'),
+    ('author', 'string'),
+    ('started', 'timestamp'),  # hora local de Jira
+    ('hours', 'float64'),
+]
+
+def is_available():
+    return pa is not None
+
+def _schema(table, metadata):
+    types = {'int64': pa.int64(), 'float64': pa.float64(), 'string': pa.string(), 'timestamp': pa.timestamp('s')}
+    columns = ISSUE_COLUMNS if table == 'issues' else WORKLOG_COLUMNS
+    return pa.schema(
+        [(name, types[type_name]) for name, type_name in columns],
+        metadata={key: json.dumps(value) for key, value in (metadata or {}).items()}
+    )
+
+def _local_datetime(value, parse):
+    if not value:
+        return None
+    try:
+        return parse(value)
+    except ValueError:
+        return None
+
+def issue_rows(sprint_id, sprint_name, detailed_issues):
+    """Filas de la tabla de issues a partir de detailed_issues de un sprint."""
+    return [
+        {
+            'sprint_id': int(sprint_id),
+            'sprint_name': sprint_name,
+            'issue_key': issue['issue_key'],
+            'issue_type': issue['issue_type'],
+            'summary': issue['summary'],
+            'assignee': issue['assignee'] or None,
+            'status': issue['status'],
+            'time_spent': issue['time_spent'],
+            'story_points': issue['story_points'],
+            'story_points_analysis': issue['story_points_analysis'],
+            'parent_summary': issue['parent_summary'] or None,
+            'created': _local_datetime(issue['fecha_creacion'], datetime.fromisoformat),
+        }
+        for issue in detailed_issues
+    ]
+
+def worklog_rows(sprint_id, sprint_name, issues):
+    """Filas de la tabla de worklogs a partir de los issues (modelo) de un sprint."""
+    return [
+        {
+            'sprint_id': int(sprint_id),
+            'sprint_name': sprint_name,
+            'issue_key': issue.key,
+            'issue_type': issue.issue_type,
+            'summary': issue.summary,
+            'author': worklog.author or None,
+            'started': _local_datetime(worklog.started, parse_jira_local),
+            'hours': float(worklog.hours),
+        }
+        for issue in issues
+        for worklog in issue.worklogs
+    ]
+
+def to_batch(table, rows):
+    """Filas de un sprint como tabla Arrow, lista para pasar a write()."""
+    return pa.Table.from_pylist(rows, schema=_schema(table, None))
+
+def write(fileobj, table, fmt, batches, metadata=None):
+    """
+    Escribe `table` ('issues' o 'worklogs') en formato `fmt` ('parquet' o
+    'arrow'). `batches` es un iterable de listas de filas o de lotes de
+    to_batch, típicamente uno por sprint; `metadata` se guarda como JSON en el
+    esquema del archivo.
+    """
+    schema = _schema(table, metadata)
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(fileobj, schema, compression=COMPRESSION)
+    else:
+        writer = pa.ipc.new_file(fileobj, schema, options=pa.ipc.IpcWriteOptions(compression=COMPRESSION))
+    try:
+        for rows in batches:
+            if isinstance(rows, pa.Table):
+                if rows.num_rows:
+                    writer.write_table(rows.replace_schema_metadata(schema.metadata))
+            elif rows:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+    finally:
+        writer.close()
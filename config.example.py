@@ -12,4 +12,47 @@ STORY_POINTS_FIELDS = [
 
 # Zona horaria para conversión y presentación de fechas
 # Ejemplos: "America/Sao_Paulo", "America/Montevideo", "Europe/Madrid"
-TIMEZONE = "America/Sao_Paulo"
\ No newline at end of file
+TIMEZONE = "America/Sao_Paulo"
+# Directorio para la caché local (sprints cerrados, exportaciones, etc.)
+# CACHE_DIR = ".cache"
+
+# TTL en segundos de la caché en memoria de metadatos (opcional)
+# METADATA_CACHE_TTL = {"projects": 3600, "boards": 3600, "board_sprints": 300, "sprint": 120}
+
+# Concurrencia y límite de tasa para las llamadas a Jira (opcional)
+# JIRA_MAX_WORKERS = 16   # hilos compartidos para descargas en paralelo
+# JIRA_RATE_LIMIT = 10    # peticiones por segundo
+# JIRA_RATE_BURST = 20    # ráfaga máxima de peticiones
+
+# Segundos mínimos entre sincronizaciones incrementales de worklogs (opcional)
+# WORKLOG_SYNC_INTERVAL = 30
+# Almacén local de worklogs: issues conservados (se descartan los menos usados) y
+# segundos mínimos entre escrituras a disco (opcional)
+# WORKLOG_STORE_MAX_ISSUES = 20000
+# WORKLOG_STORE_SAVE_INTERVAL = 30
+
+# Backend de descarga de Jira: "sync" (requests + hilos) o "async" (requiere aiohttp, ver
+# requirements-optional.txt; sin ventaja medida sobre "sync")
+# JIRA_BACKEND = "sync"
+
+# TTL en segundos de las métricas por sprint memoizadas (opcional); la clave
+# incluye la versión de datos en Jira, así que un cambio en el sprint las recalcula
+# METRICS_CACHE_TTL = 3600
+
+# Sprints que se cargan en paralelo en todo el proceso en velocidad, resumen y comparativas (opcional)
+# SPRINT_LOAD_WORKERS = 4
+
+# Backend de métricas entre sprints (opcional): "live" consulta Jira; "sqlite" usa el
+# almacén local que sincroniza POST /api/analytics/sync/<board_id> o `python analytics_store.py <board_id>`
+# METRICS_BACKEND = "live"
+# ANALYTICS_DB = ".cache/analytics.db"
+# Segundos durante los que una versión de sprint ya comprobada contra Jira no se vuelve a consultar
+# ANALYTICS_FRESHNESS_TTL = 300
+
+# Exportaciones XLSX/CSV guardadas en disco (CACHE_DIR/exports) por versión de datos (opcional)
+# EXPORT_CACHE_MAX_ENTRIES = 200
+
+# Exportaciones en segundo plano (opcional): hilos, trabajos en espera y segundos que se conservan terminados
+# EXPORT_JOB_WORKERS = 2
+# EXPORT_JOB_QUEUE_SIZE = 8
+# EXPORT_JOB_TTL = 3600
@@ -0,0 +1,204 @@
+"""
+Caché en disco de las exportaciones XLSX/CSV, direccionada por contenido.
+
+Cada exportación se identifica por un hash de la ruta, los sprints incluidos
+y la versión de datos de cada uno en Jira (cantidad de issues y `updated` más
+reciente, que también cambia al registrar o borrar worklogs). Ese hash es el
+ETag de la respuesta y el nombre del directorio donde se guarda el archivo
+generado, así que repetir una descarga sin cambios en Jira no vuelve a
+calcular nada, y si el navegador envía If-None-Match se responde 304.
+
+La versión se consulta siempre a Jira (una petición liviana por sprint),
+también para sprints cerrados: una corrección posterior en Jira genera un
+ETag nuevo en lugar de seguir sirviendo el archivo anterior.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+from flask import Response, request, send_file
+
+import config
+from jira_api import get_sprint_data_version
+from sprint_cache import CACHE_DIR
+from sprint_metrics import METRICS_REVISION
+
+EXPORT_DIR = os.path.join(CACHE_DIR, 'exports')
+EXPORT_CACHE_MAX_ENTRIES = getattr(config, 'EXPORT_CACHE_MAX_ENTRIES', 200)
+
+# Incrementar al cambiar el contenido o el formato de alguna exportación
+EXPORT_REVISION = 1
+
+_lock = threading.Lock()
+
+def data_versions(sprint_ids):
+    """
+    Versión de datos en Jira de cada sprint, `{sprint_id: versión}`. Los
+    sprints cuya versión no se pudo obtener no figuran.
+    """
+    versions = {}
+    for sprint_id in sprint_ids:
+        try:
+            versions[int(sprint_id)] = get_sprint_data_version(sprint_id)
+        except Exception as e:
+            print(f"Error getting data version for sprint {sprint_id}: {str(e)}")
+    return versions
+
+def export_etag(route, sprint_ids, versions=None):
+    """
+    ETag de la exportación `route` de los sprints indicados, o None si no se
+    pudo obtener la versión de alguno (la exportación se genera sin caché).
+    `versions` (ver data_versions) reutiliza las ya consultadas, que el
+    llamador puede pasar también al cálculo de métricas.
+    """
+    if versions is None:
+        versions = data_versions(sprint_ids)
+    if any(int(sprint_id) not in versions for sprint_id in sprint_ids):
+        return None
+    payload = json.dumps([
+        EXPORT_REVISION, METRICS_REVISION, route,
+        [[int(sprint_id), versions[int(sprint_id)]] for sprint_id in sprint_ids]
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _entry_dir(etag):
+    return os.path.join(EXPORT_DIR, etag)
+
+def send(etag, path, mimetype):
+    # conditional=True resuelve If-None-Match / If-Modified-Since con el ETag y la fecha del archivo
+    return send_file(
+        path,
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=os.path.basename(path),
+        etag=etag,
+        conditional=True
+    )
+
+def cached_path(etag):
+    """Ruta del archivo guardado para el ETag, o None si no está en la caché."""
+    if etag is None:
+        return None
+    try:
+        names = os.listdir(_entry_dir(etag))
+    except OSError:
+        return None
+    if len(names) != 1:
+        return None
+    return os.path.join(_entry_dir(etag), names[0])
+
+def cached_response(etag, mimetype):
+    """
+    304 si el cliente ya tiene esta versión, el archivo guardado si existe, o
+    None si hay que generar la exportación.
+    """
+    if etag is None:
+        return None
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    path = cached_path(etag)
+    if path is None:
+        return None
+    return send(etag, path, mimetype)
+
+def _publish(etag, tmp_path, download_name):
+    """Mueve el archivo generado a su entrada (atómico) y poda las entradas más viejas."""
+    entry_dir = _entry_dir(etag)
+    # El nombre de descarga es el nombre del archivo en disco: sin separadores de ruta
+    file_name = download_name.replace('/', '-').replace('\\', '-')
+    with _lock:
+        os.makedirs(entry_dir, exist_ok=True)
+        path = os.path.join(entry_dir, file_name)
+        os.replace(tmp_path, path)
+        # Una generación concurrente pudo dejar el mismo contenido con otro nombre
+        for name in os.listdir(entry_dir):
+            if name != file_name:
+                os.remove(os.path.join(entry_dir, name))
+        _prune()
+    return path
+
+def _prune():
+    entries = []
+    for name in os.listdir(EXPORT_DIR):
+        entry_dir = os.path.join(EXPORT_DIR, name)
+        if os.path.isdir(entry_dir):
+            entries.append((os.path.getmtime(entry_dir), entry_dir))
+    entries.sort(reverse=True)
+    for _, entry_dir in entries[EXPORT_CACHE_MAX_ENTRIES:]:
+        shutil.rmtree(entry_dir, ignore_errors=True)
+
+def _temp_file():
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    return tempfile.mkstemp(dir=EXPORT_DIR, suffix='.tmp')
+
+def save(etag, download_name, write):
+    """Genera la exportación con write(fileobj) en su entrada de la caché y devuelve su ruta."""
+    fd, tmp_path = _temp_file()
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            write(fh)
+        return _publish(etag, tmp_path, download_name)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def save_and_send(etag, download_name, mimetype, write):
+    """Genera la exportación en la caché y la envía."""
+    return send(etag, save(etag, download_name, write), mimetype)
+
+def send_export(etag, download_name, mimetype, write):
+    """
+    Genera la exportación con write(fileobj) y la envía por bloques. Con etag
+    queda en la caché; sin él se escribe en un temporal que se borra al enviarlo.
+    """
+    if etag is not None:
+        return save_and_send(etag, download_name, mimetype, write)
+    file_stream = tempfile.TemporaryFile()
+    try:
+        write(file_stream)
+    except Exception:
+        file_stream.close()
+        raise
+    file_stream.seek(0)
+    # send_file envuelve el archivo en un iterador por bloques y lo cierra (y borra) al terminar
+    return send_file(file_stream, mimetype=mimetype, as_attachment=True, download_name=download_name)
+
+def stream_and_store(etag, download_name, mimetype, chunks, cacheable=lambda: True):
+    """
+    Envía la exportación en streaming a medida que se genera y, en paralelo,
+    la escribe en la caché. Solo se publica si el envío termina completo y
+    cacheable() es verdadero (p. ej. sin sprints que fallaron al cargar).
+    """
+    headers = {'Content-Disposition': f'attachment;filename={download_name}'}
+    if etag is None:
+        return Response(chunks, mimetype=mimetype, headers=headers)
+
+    def generate():
+        fd, tmp_path = _temp_file()
+        published = False
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                for chunk in chunks:
+                    data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                    fh.write(data)
+                    yield data
+            if cacheable():
+                _publish(etag, tmp_path, download_name)
+                published = True
+        finally:
+            # Cliente desconectado o error a mitad de camino: se descarta el parcial
+            if not published and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    response = Response(generate(), mimetype=mimetype, headers=headers)
+    response.set_etag(etag)
+    # Misma validación que las respuestas desde caché (send_file usa la fecha del archivo)
+    response.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+    return response
@@ -0,0 +1,126 @@
+"""
+Exportaciones en segundo plano.
+
+Una exportación grande (p. ej. la comparativa de muchos sprints) no se
+genera dentro de la petición: se encola como trabajo, el cliente consulta su
+progreso (sprints cargados, filas escritas) y, al terminar, descarga el
+archivo. Los trabajos corren en un pool propio de EXPORT_JOB_WORKERS hilos y
+la cola está acotada: con EXPORT_JOB_QUEUE_SIZE trabajos esperando, submit
+rechaza los nuevos en lugar de acumularlos.
+
+Los trabajos terminados se conservan EXPORT_JOB_TTL segundos; después se
+descartan junto con su archivo.
+"""
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from sprint_cache import CACHE_DIR
+
+EXPORT_JOB_WORKERS = getattr(config, 'EXPORT_JOB_WORKERS', 2)
+EXPORT_JOB_QUEUE_SIZE = getattr(config, 'EXPORT_JOB_QUEUE_SIZE', 8)
+EXPORT_JOB_TTL = getattr(config, 'EXPORT_JOB_TTL', 3600)
+JOBS_DIR = os.path.join(CACHE_DIR, 'export_jobs')
+
+class QueueFull(Exception):
+    """No hay lugar en la cola de exportaciones."""
+
+class ExportJob:
+    def __init__(self, kind, sprints_total):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.state = 'queued'
+        self.sprints_total = sprints_total
+        self.sprints_loaded = 0
+        self.rows_written = 0
+        self.rows_total = 0
+        self.error = None
+        self.path = None
+        self.etag = None
+        self.created = time.time()
+        self.finished = None
+
+    def sprint_loaded(self):
+        self.sprints_loaded += 1
+
+    def rows_progress(self, rows_written, rows_total):
+        self.rows_written = rows_written
+        self.rows_total = rows_total
+
+    def write_file(self, download_name, write):
+        """Escribe el resultado con write(fileobj) en un archivo propio del trabajo y devuelve su ruta."""
+        job_dir = os.path.join(JOBS_DIR, self.id)
+        os.makedirs(job_dir, exist_ok=True)
+        path = os.path.join(job_dir, download_name.replace('/', '-').replace('\\', '-'))
+        with open(path, 'wb') as fh:
+            write(fh)
+        return path
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'state': self.state,
+            'sprints_total': self.sprints_total,
+            'sprints_loaded': self.sprints_loaded,
+            'rows_written': self.rows_written,
+            'rows_total': self.rows_total,
+            'error': self.error
+        }
+
+_executor = ThreadPoolExecutor(max_workers=EXPORT_JOB_WORKERS, thread_name_prefix='export-job')
+# Trabajos en ejecución o en espera: los que corren más los que caben en la cola
+_slots = threading.BoundedSemaphore(EXPORT_JOB_WORKERS + EXPORT_JOB_QUEUE_SIZE)
+_jobs = {}
+_lock = threading.Lock()
+
+def _run(job, task):
+    job.state = 'running'
+    try:
+        job.path, job.etag = task(job)
+        job.state = 'done'
+    except Exception as e:
+        print(f"Error in export job {job.id}: {str(e)}")
+        job.error = str(e)
+        job.state = 'error'
+    finally:
+        job.finished = time.time()
+        _slots.release()
+
+def _expire():
+    now = time.time()
+    with _lock:
+        expired = [job for job in _jobs.values() if job.finished and now - job.finished > EXPORT_JOB_TTL]
+        for job in expired:
+            del _jobs[job.id]
+    for job in expired:
+        shutil.rmtree(os.path.join(JOBS_DIR, job.id), ignore_errors=True)
+
+def submit(kind, sprints_total, task):
+    """
+    Encola task(job), que debe devolver `(path, etag)` del archivo generado
+    (etag None si no quedó en la caché de exportaciones). Lanza QueueFull si
+    la cola está completa.
+    """
+    _expire()
+    if not _slots.acquire(blocking=False):
+        raise QueueFull('La cola de exportaciones está llena, reintentar en unos minutos')
+    job = ExportJob(kind, sprints_total)
+    with _lock:
+        _jobs[job.id] = job
+    try:
+        _executor.submit(_run, job, task)
+    except Exception:
+        with _lock:
+            del _jobs[job.id]
+        _slots.release()
+        raise
+    return job
+
+def get(job_id):
+    with _lock:
+        return _jobs.get(job_id)
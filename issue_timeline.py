@@ -0,0 +1,93 @@
+"""
+Línea de tiempo de estado y tipo de un issue, construida una vez a partir de
+su changelog.
+
+Usa las transiciones de `status` e `issuetype` que el modelo `Issue` ya trae
+ordenadas y con la fecha parseada, y responde "¿qué estado/tipo tenía el
+issue en el momento T?" con búsqueda binaria. La línea de tiempo se guarda en
+el propio issue para reutilizarla entre métricas y exportaciones.
+"""
+from bisect import bisect_right
+
+class Transitions:
+    """Transiciones de un campo ordenadas cronológicamente."""
+    __slots__ = ('times', 'from_values', 'to_values')
+
+    def __init__(self, changes):
+        self.times = [change[0] for change in changes]
+        self.from_values = [change[1] for change in changes]
+        self.to_values = [change[2] for change in changes]
+
+    def __len__(self):
+        return len(self.times)
+
+    def index_at(self, when):
+        """Índice de la última transición ocurrida en `when` o antes (-1 si ninguna)."""
+        return bisect_right(self.times, when) - 1
+
+class IssueTimeline:
+    __slots__ = ('current_status', 'current_type', 'status', 'issuetype', 'sprints', 'created', 'initial_status')
+
+    def __init__(self, current_status, current_type, status_changes, type_changes, sprint_changes=(), created=None):
+        self.current_status = current_status
+        self.current_type = current_type
+        self.status = Transitions(status_changes)
+        self.issuetype = Transitions(type_changes)
+        # Cambios del campo Sprint: (fecha, ids de origen, ids de destino)
+        self.sprints = Transitions(sprint_changes)
+        self.created = created
+        # Estado previo al primer cambio registrado
+        self.initial_status = next((value for value in self.status.from_values if value is not None), None)
+
+    @classmethod
+    def from_issue(cls, issue):
+        return cls(issue.status, issue.issue_type, issue.status_changes, issue.type_changes, issue.sprint_changes, issue.created)
+
+    def status_at(self, when):
+        """
+        Estado vigente en `when`: el destino del último cambio anterior; si no
+        hubo cambios hasta entonces, el estado de origen del primer cambio; y si
+        no hay changelog, el estado actual.
+        """
+        if when is None:
+            return self.current_status
+        index = self.status.index_at(when)
+        if index >= 0 and self.status.to_values[index]:
+            return self.status.to_values[index]
+        if self.initial_status:
+            return self.initial_status
+        return self.current_status
+
+    def type_at(self, when):
+        """
+        Tipo vigente en `when`: el destino del último cambio anterior; si no lo
+        hay, el tipo de origen del primer cambio posterior; si no, el actual.
+        """
+        if when is None:
+            return self.current_type
+        index = self.issuetype.index_at(when)
+        if index >= 0 and self.issuetype.to_values[index]:
+            return self.issuetype.to_values[index]
+        if index + 1 < len(self.issuetype):
+            return self.issuetype.from_values[index + 1] or self.current_type
+        return self.current_type
+
+    def in_sprint_at(self, sprint_id, when):
+        """
+        Si el issue pertenecía al sprint en `when`, según los cambios del campo
+        Sprint. Sin cambios registrados, un issue creado después de `when` no
+        estaba en el sprint; cualquier otro sí.
+        """
+        sprint_id = str(sprint_id)
+        index = self.sprints.index_at(when)
+        if index >= 0:
+            return sprint_id in self.sprints.to_values[index]
+        if len(self.sprints):
+            return sprint_id in self.sprints.from_values[0]
+        return self.created is None or self.created <= when
+
+def get_timeline(issue):
+    """Línea de tiempo del issue, construida la primera vez que se consulta."""
+    if issue._timeline is None:
+        issue._timeline = IssueTimeline.from_issue(issue)
+    return issue._timeline
@@ -2,11 +2,21 @@ import requests
 from requests.auth import HTTPBasicAuth
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+import atexit
 import json
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pytz
-from config import JIRA_URL, JIRA_USER, JIRA_API_TOKEN, TIMEZONE, STORY_POINTS_FIELDS
+import config
+import sprint_cache
+from memory_cache import ttl_cache
+from single_flight import SingleFlight
+from rate_limit import TokenBucket, parse_retry_after
+from worklog_store import WorklogStore
+from jira_dates import get_timezone, normalize_jira_timestamp, parse_jira_epoch, to_configured_tz
+from models import build_issues
+from config import JIRA_URL, JIRA_USER, JIRA_API_TOKEN, STORY_POINTS_FIELDS
 
 # Usar las variables de configuración
 # Normalizar URL base para evitar dobles slashes
@@ -16,6 +26,60 @@ auth = HTTPBasicAuth(JIRA_USER, JIRA_API_TOKEN)
 # Cliente HTTP resiliente con reintentos y timeouts
 DEFAULT_TIMEOUT = (10, 60)  # (connect, read) en segundos
 
+# Paginación de la API de Jira
+ISSUES_PAGE_SIZE = 100      # Jira Cloud limita las páginas a 100 issues
+SPRINTS_PAGE_SIZE = 50      # máximo de la API Agile para /board/{id}/sprint
+
+# Campos de issue que realmente usa la aplicación (más los de Story Points).
+# Pedir solo estos evita descargar todos los custom fields, descripciones, etc.
+ISSUE_FIELDS = [
+    'summary',
+    'status',
+    'issuetype',
+    'assignee',
+    'parent',
+    'priority',
+    'created',
+    'resolutiondate',
+    'updated',
+    'worklog',
+] + list(STORY_POINTS_FIELDS)
+
+# Concurrencia y tasa máxima de llamadas a Jira para todo el proceso
+JIRA_MAX_WORKERS = getattr(config, 'JIRA_MAX_WORKERS', 16)
+JIRA_RATE_LIMIT = getattr(config, 'JIRA_RATE_LIMIT', 10)      # peticiones/segundo
+JIRA_RATE_BURST = getattr(config, 'JIRA_RATE_BURST', 20)      # ráfaga máxima
+RATE_LIMIT_MAX_RETRIES = 5                                    # reintentos ante 429
+
+# Backend de descarga: 'sync' (requests + hilos) o 'async' (asyncio + aiohttp)
+JIRA_BACKEND = getattr(config, 'JIRA_BACKEND', 'sync')
+
+# Sincronización incremental de worklogs
+WORKLOG_SYNC_INTERVAL = getattr(config, 'WORKLOG_SYNC_INTERVAL', 30)  # segundos entre syncs
+WORKLOG_LIST_BATCH = 1000   # máximo de ids por llamada a /worklog/list
+
+# Changelog completo de issues con historiales largos
+CHANGELOG_BULK_BATCH = 1000   # máximo de issues por llamada a /changelog/bulkfetch
+CHANGELOG_PAGE_SIZE = 100     # tamaño de página de /issue/{key}/changelog
+
+# TTL (segundos) de la caché en memoria de metadatos, por tipo
+METADATA_CACHE_TTL = {
+    'projects': 3600,
+    'boards': 3600,
+    'board_sprints': 300,
+    'sprint': 120,
+}
+METADATA_CACHE_TTL.update(getattr(config, 'METADATA_CACHE_TTL', {}))
+
+# Descargas de sprints en curso, compartidas entre peticiones concurrentes
+_issues_flight = SingleFlight()
+_sync_flight = SingleFlight()
+
+worklog_store = WorklogStore()
+worklog_store.load()
+# Las escrituras se agrupan: lo pendiente se guarda al terminar el proceso
+atexit.register(worklog_store.save, force=True)
+
 session = requests.Session()
 retries = Retry(
     total=3,
@@ -23,19 +87,62 @@ retries = Retry(
     read=3,
     status=3,
     backoff_factor=0.5,
-    status_forcelist=[429, 500, 502, 503, 504],
+    # Los 429 los gestiona el limitador compartido respetando Retry-After
+    status_forcelist=[500, 502, 503, 504],
     allowed_methods={"GET"},
 )
-adapter = HTTPAdapter(max_retries=retries)
+adapter = HTTPAdapter(max_retries=retries, pool_maxsize=JIRA_MAX_WORKERS)
 session.mount("https://", adapter)
 session.mount("http://", adapter)
 
+rate_limiter = TokenBucket(JIRA_RATE_LIMIT, JIRA_RATE_BURST)
+
+# Pool único de hilos para las descargas en paralelo (páginas, worklogs)
+_executor = ThreadPoolExecutor(max_workers=JIRA_MAX_WORKERS, thread_name_prefix='jira')
+_pool_lock = threading.Lock()
+_pool_state = {'queued': 0, 'active': 0}
+
+def _run_tracked(fn, *args):
+    with _pool_lock:
+        _pool_state['queued'] -= 1
+        _pool_state['active'] += 1
+    try:
+        return fn(*args)
+    finally:
+        with _pool_lock:
+            _pool_state['active'] -= 1
+
+def _submit(fn, *args):
+    with _pool_lock:
+        _pool_state['queued'] += 1
+    return _executor.submit(_run_tracked, fn, *args)
+
+def get_pool_stats():
+    with _pool_lock:
+        pool = dict(_pool_state, max_workers=JIRA_MAX_WORKERS)
+    return {'pool': pool, 'rate_limiter': rate_limiter.stats(), 'worklog_store': worklog_store.stats()}
+
 def _get(url, params=None):
-    response = session.get(url, auth=auth, params=params, timeout=DEFAULT_TIMEOUT)
+    return _request('GET', url, params=params)
+
+def _post(url, payload):
+    return _request('POST', url, json_body=payload)
+
+def _request(method, url, params=None, json_body=None):
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        rate_limiter.acquire()
+        response = session.request(method, url, auth=auth, params=params, json=json_body, timeout=DEFAULT_TIMEOUT)
+        rate_limiter.update_from_headers(response.headers)
+        if response.status_code != 429 or attempt == RATE_LIMIT_MAX_RETRIES:
+            break
+        # Sin Retry-After, backoff exponencial compartido por todos los hilos
+        if parse_retry_after(response.headers.get('Retry-After')) is None:
+            rate_limiter.pause(0.5 * (2 ** attempt))
     # Levantar excepción si no es 2xx
     response.raise_for_status()
     return response
 
+@ttl_cache('projects', METADATA_CACHE_TTL['projects'], maxsize=1)
 def get_projects():
     url = f"{URL}/rest/api/3/project"
     response = _get(url)
@@ -43,29 +150,63 @@ def get_projects():
     projects.sort(key=lambda x: x['id'], reverse=True)
     return projects
 
+@ttl_cache('boards', METADATA_CACHE_TTL['boards'], maxsize=256)
 def get_boards_for_project(project_id):
     url = f"{URL}/rest/agile/1.0/board?projectKeyOrId={project_id}"
     response = _get(url)
     boards = response.json()
     return boards['values']
 
-def get_sprints_for_board(board_id):
+def _list_board_sprints(board_id):
+    """
+    Todos los sprints del tablero. Jira los devuelve paginados (de a 50, del
+    más viejo al más nuevo) y sin total: se piden páginas hasta `isLast`.
+    """
     url = f"{URL}/rest/agile/1.0/board/{board_id}/sprint"
-    response = _get(url)
-    sprints = response.json()
-    return sprints['values']
+    sprints = []
+    start_at = 0
+    while True:
+        page = _get(url, params={'startAt': start_at, 'maxResults': SPRINTS_PAGE_SIZE}).json()
+        values = page.get('values', [])
+        sprints.extend(values)
+        if page.get('isLast', True) or not values:
+            return sprints
+        start_at += len(values)
+
+@ttl_cache('board_sprints', METADATA_CACHE_TTL['board_sprints'], maxsize=256)
+def get_sprints_for_board(board_id):
+    return _list_board_sprints(board_id)
 
 def get_sprints():
-    url = f"{URL}/rest/agile/1.0/board/{BOARD_ID}/sprint"
-    response = _get(url)
-    sprints = response.json()['values']
+    sprints = _list_board_sprints(BOARD_ID)
     sprints.sort(key=lambda x: x['startDate'], reverse=True)
     return sprints
 
-def get_issues_in_sprint(sprint_id):
-    url = f"{URL}/rest/agile/1.0/sprint/{sprint_id}/issue?startAt=0&maxResults=500&expand=fields,changelog"
-    response = _get(url)
-    issues = response.json()['issues']
+def _sprint_issues_params(start_at, include_changelog=False):
+    params = {
+        'startAt': start_at,
+        'maxResults': ISSUES_PAGE_SIZE,
+        'fields': ','.join(ISSUE_FIELDS),
+    }
+    # El changelog solo lo necesitan las rutas que calculan el estado al cierre
+    if include_changelog:
+        params['expand'] = 'changelog'
+    return params
+
+def _get_sprint_issues_page(sprint_id, start_at, include_changelog=False):
+    url = f"{URL}/rest/agile/1.0/sprint/{sprint_id}/issue"
+    return _get(url, params=_sprint_issues_params(start_at, include_changelog)).json()
+
+def _remaining_page_offsets(first_page):
+    """Offsets de las páginas que faltan tras la primera."""
+    fetched = len(first_page['issues'])
+    total = first_page.get('total', fetched)
+    page_size = first_page.get('maxResults') or fetched
+    if not page_size or total <= fetched:
+        return []
+    return list(range(fetched, total, page_size))
+
+def _normalize_issues(issues):
     for issue in issues:
         issue_type = issue['fields']['issuetype']
         issue_type['iconUrl'] = issue_type['iconUrl']
@@ -73,14 +214,201 @@ def get_issues_in_sprint(sprint_id):
         issue['fields']['story_points'] = get_story_points_from_fields(issue['fields'])
     return issues
 
-def get_worklogs(issue_id):
-    url = f"{URL}/rest/api/3/issue/{issue_id}/worklog"
-    response = _get(url)
-    worklogs = response.json()['worklogs']
+def get_issues_in_sprint(sprint_id, include_changelog=False):
+    if JIRA_BACKEND == 'async':
+        import jira_api_async
+        return jira_api_async.run(jira_api_async.get_issues_in_sprint(sprint_id, include_changelog))
+
+    # La primera página indica el total y el tamaño real de página que aplica Jira
+    # (Jira Cloud puede devolver menos issues que las pedidas en maxResults)
+    first_page = _get_sprint_issues_page(sprint_id, 0, include_changelog)
+    issues = list(first_page['issues'])
+
+    # Pedir el resto de páginas en paralelo y unirlas en el orden de los offsets
+    futures = [
+        _submit(_get_sprint_issues_page, sprint_id, start_at, include_changelog)
+        for start_at in _remaining_page_offsets(first_page)
+    ]
+    for future in futures:
+        issues.extend(future.result()['issues'])
+    return _normalize_issues(issues)
+
+def _normalize_worklogs(worklogs):
     for worklog in worklogs:
         worklog['authorAvatar'] = worklog['author']['avatarUrls']['48x48']
     return worklogs
 
+def get_worklogs(issue_id):
+    url = f"{URL}/rest/api/3/issue/{issue_id}/worklog"
+    response = _get(url)
+    return _normalize_worklogs(response.json()['worklogs'])
+
+def get_worklogs_for_issues(issue_ids):
+    """Descarga en paralelo los worklogs de varios issues: {issue_id: worklogs}."""
+    if JIRA_BACKEND == 'async':
+        import jira_api_async
+        return jira_api_async.run(jira_api_async.get_worklogs_for_issues(issue_ids))
+
+    futures = {issue_id: _submit(get_worklogs, issue_id) for issue_id in issue_ids}
+    return {issue_id: future.result() for issue_id, future in futures.items()}
+
+def _changelog_truncated(issue):
+    changelog = issue.get('changelog')
+    if not changelog:
+        return False
+    return changelog.get('total', 0) > len(changelog.get('histories', []))
+
+def _normalize_histories(histories):
+    # bulkfetch puede devolver `created` como epoch: se lleva al ISO de expand=changelog
+    for history in histories:
+        history['created'] = normalize_jira_timestamp(history.get('created'))
+    return histories
+
+def _get_changelog_bulk_batch(issue_ids):
+    url = f"{URL}/rest/api/3/changelog/bulkfetch"
+    payload = {'issueIdsOrKeys': issue_ids, 'maxResults': 1000}
+    histories = {issue_id: [] for issue_id in issue_ids}
+    while True:
+        data = _post(url, payload).json()
+        for change_log in data.get('issueChangeLogs', []):
+            histories.setdefault(str(change_log['issueId']), []).extend(_normalize_histories(change_log.get('changeHistories', [])))
+        next_token = data.get('nextPageToken')
+        if not next_token:
+            return histories
+        payload = dict(payload, nextPageToken=next_token)
+
+def get_changelogs_bulk(issue_ids):
+    """Changelog completo de muchos issues con /changelog/bulkfetch (Jira Cloud)."""
+    batches = [issue_ids[i:i + CHANGELOG_BULK_BATCH] for i in range(0, len(issue_ids), CHANGELOG_BULK_BATCH)]
+    futures = [_submit(_get_changelog_bulk_batch, batch) for batch in batches]
+    histories = {}
+    for future in futures:
+        histories.update(future.result())
+    return histories
+
+def _get_changelog_page(issue_id, start_at):
+    url = f"{URL}/rest/api/3/issue/{issue_id}/changelog"
+    params = {'startAt': start_at, 'maxResults': CHANGELOG_PAGE_SIZE}
+    return _get(url, params=params).json().get('values', [])
+
+def get_changelogs_paged(totals):
+    """
+    Changelog completo vía /issue/{id}/changelog. Recibe {issue_id: total} y
+    pide todas las páginas de todos los issues en paralelo.
+    """
+    futures = {
+        issue_id: [_submit(_get_changelog_page, issue_id, start_at) for start_at in range(0, total, CHANGELOG_PAGE_SIZE)]
+        for issue_id, total in totals.items()
+    }
+    return {
+        issue_id: [history for page in pages for history in page.result()]
+        for issue_id, pages in futures.items()
+    }
+
+def complete_changelogs(issues):
+    """
+    `expand=changelog` trae como mucho 100 entradas por issue. Para los issues
+    truncados descarga el historial completo (bulkfetch, o paginado si la
+    instancia no lo soporta) y lo reemplaza en `issue['changelog']`.
+    """
+    truncated = [issue for issue in issues if _changelog_truncated(issue)]
+    if not truncated:
+        return issues
+
+    try:
+        histories = get_changelogs_bulk([issue['id'] for issue in truncated])
+    except requests.exceptions.HTTPError:
+        histories = get_changelogs_paged({issue['id']: issue['changelog']['total'] for issue in truncated})
+
+    for issue in truncated:
+        issue_histories = histories.get(issue['id'], [])
+        if not issue_histories:
+            continue
+        issue['changelog'] = {
+            'startAt': 0,
+            'maxResults': len(issue_histories),
+            'total': len(issue_histories),
+            'histories': issue_histories,
+        }
+    return issues
+
+def get_embedded_worklogs(issue):
+    """
+    Devuelve los worklogs que Jira ya incluye en `fields.worklog` del issue si
+    están completos (total <= cantidad recibida), o None si hay que pedirlos
+    al endpoint de worklogs.
+    """
+    embedded = issue['fields'].get('worklog')
+    if not embedded:
+        return None
+    worklogs = embedded.get('worklogs', [])
+    if embedded.get('total', 0) > len(worklogs):
+        return None
+    return _normalize_worklogs(worklogs)
+
+def _get_changed_worklog_ids(endpoint, since):
+    """
+    Recorre /worklog/updated o /worklog/deleted desde `since` (ms) y devuelve
+    los ids informados junto con el nuevo cursor (`until` de la última página).
+    """
+    ids = []
+    url = f"{URL}/rest/api/3/worklog/{endpoint}"
+    params = {'since': since}
+    while True:
+        data = _get(url, params=params).json()
+        ids.extend(value['worklogId'] for value in data.get('values', []))
+        since = data.get('until', since)
+        if data.get('lastPage', True):
+            return ids, since
+        params = {'since': since}
+
+def get_worklogs_by_ids(worklog_ids):
+    """Descarga worklogs por id en lotes de hasta 1000 (/worklog/list)."""
+    url = f"{URL}/rest/api/3/worklog/list"
+    batches = [worklog_ids[i:i + WORKLOG_LIST_BATCH] for i in range(0, len(worklog_ids), WORKLOG_LIST_BATCH)]
+    futures = [_submit(lambda batch: _post(url, {'ids': batch}).json(), batch) for batch in batches]
+    worklogs = []
+    for future in futures:
+        worklogs.extend(future.result())
+    return _normalize_worklogs(worklogs)
+
+def _sync_worklogs():
+    if worklog_store.since is None:
+        # Primer uso: los issues se cargan completos y desde aquí se siguen los cambios
+        worklog_store.set_cursor(int(time.time() * 1000))
+        return 0
+
+    updated_ids, until = _get_changed_worklog_ids('updated', worklog_store.since)
+    deleted_ids, _ = _get_changed_worklog_ids('deleted', worklog_store.since)
+    changes = 0
+    if updated_ids:
+        changes += worklog_store.apply_updates(get_worklogs_by_ids(updated_ids))
+    if deleted_ids:
+        changes += worklog_store.apply_deletions(deleted_ids)
+    worklog_store.set_cursor(until)
+    worklog_store.save()
+    return changes
+
+def sync_worklogs(force=False):
+    """
+    Trae de Jira los worklogs creados, modificados o borrados desde la última
+    sincronización y los aplica al almacén local. Se limita a una ejecución
+    cada WORKLOG_SYNC_INTERVAL segundos salvo que se fuerce, también tras un
+    fallo: hasta la siguiente sincronización correcta el almacén queda marcado
+    como desactualizado (worklog_store.synced es False).
+    """
+    if not force and time.monotonic() - worklog_store.last_sync < WORKLOG_SYNC_INTERVAL:
+        return 0
+    try:
+        changes = _sync_flight.do('worklogs', _sync_worklogs)
+        worklog_store.synced = True
+    except Exception as e:
+        print(f"Error syncing worklogs: {str(e)}")
+        worklog_store.synced = False
+        changes = 0
+    worklog_store.last_sync = time.monotonic()
+    return changes
+
 def convert_time_to_hours(time_spent):
     time_units = {
         'd': 8,
@@ -95,24 +423,19 @@ def convert_time_to_hours(time_spent):
     return total_hours
 
 def filter_worklogs_by_sprint(worklogs, sprint_start, sprint_end):
-    filtered_worklogs = []
-    for worklog in worklogs:
-        worklog_date = datetime.strptime(worklog['started'], '%Y-%m-%dT%H:%M:%S.%f%z')
-        # Convertir worklog_date a la misma timezone que sprint_start y sprint_end
-        worklog_date = worklog_date.astimezone(sprint_start.tzinfo)
-        if sprint_start <= worklog_date <= sprint_end:
-            filtered_worklogs.append(worklog)
-    return filtered_worklogs
+    # Comparar como epoch evita convertir cada worklog a la zona del sprint
+    start_ts = sprint_start.timestamp()
+    end_ts = sprint_end.timestamp()
+    return [
+        worklog for worklog in worklogs
+        if start_ts <= parse_jira_epoch(worklog['started']) <= end_ts
+    ]
 
 def format_date_to_utc3(date_str):
     """Convierte una fecha UTC a la zona horaria configurada y la formatea."""
     if not date_str:
         return ''
-    utc = pytz.UTC
-    configured_tz = pytz.timezone(TIMEZONE)
-    date = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S.%f%z')
-    date_in_tz = date.astimezone(configured_tz)
-    return date_in_tz.strftime('%Y-%m-%d %H:%M:%S')
+    return to_configured_tz(date_str).strftime('%Y-%m-%d %H:%M:%S')
 
 def get_story_points_from_fields(fields):
     """
@@ -129,44 +452,129 @@ def get_story_points_from_fields(fields):
             continue
     return 0.0
 
-def get_sprint_details(sprint_id):
+@ttl_cache('sprint', METADATA_CACHE_TTL['sprint'], maxsize=512)
+def _get_sprint(sprint_id):
     url = f"{URL}/rest/agile/1.0/sprint/{sprint_id}"
     response = _get(url)
-    sprint = response.json()
+    return response.json()
+
+def get_sprint_details(sprint_id):
+    sprint = _get_sprint(sprint_id)
     # Convertir fechas a UTC-3
     sprint['startDate'] = format_date_to_utc3(sprint.get('startDate'))
     sprint['endDate'] = format_date_to_utc3(sprint.get('endDate'))
     sprint['completeDate'] = format_date_to_utc3(sprint.get('completeDate'))
     return sprint
 
-def get_issues_with_details(sprint_id):
-    issues = get_issues_in_sprint(sprint_id)
-    sprint_details = get_sprint_details(sprint_id)
-    
+def get_sprint_data_version(sprint_id):
+    """
+    Versión de los datos de un sprint: cantidad de issues y el `updated` más
+    reciente. Registrar un worklog o cambiar un issue actualiza `updated`, así que
+    sirve para invalidar la caché sin descargar el sprint completo.
+    """
+    url = f"{URL}/rest/agile/1.0/sprint/{sprint_id}/issue"
+    params = {
+        'fields': 'updated',
+        'maxResults': 1,
+        'jql': 'ORDER BY updated DESC',
+    }
+    data = _get(url, params=params).json()
+    issues = data.get('issues', [])
+    last_updated = issues[0]['fields'].get('updated', '') if issues else ''
+    return f"{data.get('total', 0)}:{last_updated}"
+
+def get_sprint_data_versions(sprint_ids):
+    """Versión de datos de varios sprints, consultadas en paralelo: {sprint_id: versión}."""
+    futures = {sprint_id: _submit(get_sprint_data_version, sprint_id) for sprint_id in sprint_ids}
+    return {sprint_id: future.result() for sprint_id, future in futures.items()}
+
+def _fetch_issues_with_details(sprint_id, sprint_details, include_changelog):
+    issues = get_issues_in_sprint(sprint_id, include_changelog)
+    if include_changelog:
+        complete_changelogs(issues)
+
     # Convertir las fechas de string a datetime objetos en UTC-3
     sprint_start = datetime.strptime(sprint_details['startDate'], '%Y-%m-%d %H:%M:%S')
     sprint_end_date = datetime.strptime(sprint_details['endDate'], '%Y-%m-%d %H:%M:%S').date()
     # Ajustar la hora de cierre del sprint a las 23:59:59
     sprint_end = datetime.combine(sprint_end_date, datetime.max.time().replace(hour=23, minute=59, second=59, microsecond=0))
-    tz = pytz.timezone(TIMEZONE)
+    tz = get_timezone()
     sprint_start = tz.localize(sprint_start)
     sprint_end = tz.localize(sprint_end)
     
-    with ThreadPoolExecutor() as executor:
-        futures = {executor.submit(get_worklogs, issue['id']): issue for issue in issues}
-        for future in futures:
-            issue = futures[future]
-            worklogs = future.result()
-            filtered_worklogs = filter_worklogs_by_sprint(worklogs, sprint_start, sprint_end)
-            for worklog in filtered_worklogs:
-                worklog['timeSpentHours'] = convert_time_to_hours(worklog['timeSpent'])
-            issue['worklogs'] = filtered_worklogs if filtered_worklogs else []
+    # Los issues ya presentes en el almacén local se leen de ahí (al día tras
+    # la sincronización incremental). Del resto se usan los worklogs embebidos y
+    # solo se consulta el endpoint para issues con más de los que Jira embebe.
+    # Si la sincronización falló, el almacén no se lee y todos los issues se
+    # vuelven a cargar así.
+    sync_worklogs()
+    worklogs_by_issue = {}
+    pending_ids = []
+    for issue in issues:
+        stored = worklog_store.get(issue['id']) if worklog_store.synced else None
+        if stored is not None:
+            worklogs_by_issue[issue['id']] = stored
+            continue
+        embedded = get_embedded_worklogs(issue)
+        if embedded is None:
+            pending_ids.append(issue['id'])
+        else:
+            worklogs_by_issue[issue['id']] = worklog_store.seed(issue['id'], embedded)
+
+    for issue_id, worklogs in get_worklogs_for_issues(pending_ids).items():
+        worklogs_by_issue[issue_id] = worklog_store.seed(issue_id, worklogs)
+    worklog_store.save()
+
+    for issue in issues:
+        worklogs = [dict(worklog) for worklog in worklogs_by_issue[issue['id']]]
+        filtered_worklogs = filter_worklogs_by_sprint(worklogs, sprint_start, sprint_end)
+        for worklog in filtered_worklogs:
+            worklog['timeSpentHours'] = convert_time_to_hours(worklog['timeSpent'])
+        issue['worklogs'] = filtered_worklogs if filtered_worklogs else []
+    return issues
+
+def get_issues_with_details(sprint_id, include_changelog=False, data_version=None):
+    """
+    Issues del sprint con sus worklogs filtrados al período del sprint.
+    Con include_changelog=True se expande además el historial de cambios,
+    necesario para calcular el estado de cada issue al cierre del sprint.
+    data_version, si el llamador ya la consultó, evita pedirla otra vez.
+    """
+    # Varios usuarios abriendo el mismo sprint a la vez comparten una única descarga
+    key = (int(sprint_id), include_changelog)
+    return _issues_flight.do(key, _get_issues_with_details, sprint_id, include_changelog, data_version)
+
+def _get_issues_with_details(sprint_id, include_changelog, data_version=None):
+    sprint_details = get_sprint_details(sprint_id)
+
+    # Los sprints cerrados prácticamente no cambian: servirlos desde la caché en
+    # disco mientras la versión de datos en Jira siga siendo la misma
+    if sprint_details.get('state', '').upper() != 'CLOSED':
+        return _fetch_issues_with_details(sprint_id, sprint_details, include_changelog)
+
+    if data_version is None:
+        data_version = get_sprint_data_version(sprint_id)
+    variant = 'changelog' if include_changelog else 'lean'
+    issues = sprint_cache.load(sprint_id, data_version, variant)
+    if issues is None and not include_changelog:
+        # La variante con changelog también sirve para quien no lo necesita
+        issues = sprint_cache.load(sprint_id, data_version, 'changelog')
+    if issues is None:
+        issues = _fetch_issues_with_details(sprint_id, sprint_details, include_changelog)
+        sprint_cache.save(sprint_id, data_version, issues, variant)
     return issues
 
+def get_sprint_issues(sprint_id, include_changelog=False, data_version=None):
+    """
+    Issues del sprint en el modelo interno compacto (`models.Issue`), para
+    métricas y exportaciones. El JSON de Jira se descarta apenas se construye
+    el modelo; la ruta de detalle, que lo devuelve tal cual, usa
+    get_issues_with_details.
+    """
+    return build_issues(get_issues_with_details(sprint_id, include_changelog, data_version))
+
 def get_sprint_name(sprint_id):
-    url = f"{URL}/rest/agile/1.0/sprint/{sprint_id}"
-    response = _get(url)
-    sprint = response.json()
+    sprint = _get_sprint(sprint_id)
     return sprint['name']
 
 def get_task_summary(issues):
@@ -0,0 +1,117 @@
+"""
+Cliente asíncrono (asyncio + aiohttp) para la capa de descarga de Jira.
+
+Ofrece las mismas funciones que jira_api para la parte de I/O intensiva
+(issues de un sprint y worklogs) ejecutándolas sobre un único event loop con
+un pool de conexiones persistente y concurrencia acotada por semáforo, en
+lugar de un hilo por llamada. El resto de las llamadas sigue por el cliente
+síncrono. Medido con benchmarks/bench_backends.py no mostró una ventaja
+consistente sobre el backend síncrono, que sigue siendo el predeterminado.
+
+Se activa con JIRA_BACKEND = "async" en config.py. Las funciones síncronas de
+jira_api delegan aquí vía `run()`, que ejecuta la corrutina en un event loop
+de fondo compartido por todo el proceso.
+"""
+import asyncio
+import threading
+
+import requests
+
+import jira_api
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - dependencia opcional
+    aiohttp = None
+
+_loop = None
+_loop_lock = threading.Lock()
+_session = None
+_semaphore = None
+
+def _ensure_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            if aiohttp is None:
+                raise RuntimeError("JIRA_BACKEND='async' requiere el paquete aiohttp (pip install -r requirements-optional.txt)")
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name='jira-async', daemon=True)
+            thread.start()
+    return _loop
+
+def run(coro):
+    """Ejecuta una corrutina en el event loop compartido y espera su resultado."""
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+def _get_session():
+    # Se crea dentro del event loop compartido y se reutiliza entre llamadas
+    global _session, _semaphore
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=jira_api.JIRA_MAX_WORKERS)
+        timeout = aiohttp.ClientTimeout(sock_connect=jira_api.DEFAULT_TIMEOUT[0], sock_read=jira_api.DEFAULT_TIMEOUT[1])
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            auth=aiohttp.BasicAuth(jira_api.JIRA_USER, jira_api.JIRA_API_TOKEN),
+        )
+        _semaphore = asyncio.Semaphore(jira_api.JIRA_MAX_WORKERS)
+    return _session
+
+def _http_error(url, status):
+    # Mismo tipo de excepción que el backend síncrono para que app.py la trate igual
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    return requests.exceptions.HTTPError(f"{status} Error for url: {url}", response=response)
+
+async def _get(url, params=None):
+    session = _get_session()
+    async with _semaphore:
+        for attempt in range(jira_api.RATE_LIMIT_MAX_RETRIES + 1):
+            await jira_api.rate_limiter.acquire_async()
+            async with session.get(url, params=params) as response:
+                jira_api.rate_limiter.update_from_headers(response.headers)
+                if response.status == 429 and attempt < jira_api.RATE_LIMIT_MAX_RETRIES:
+                    if jira_api.parse_retry_after(response.headers.get('Retry-After')) is None:
+                        jira_api.rate_limiter.pause(0.5 * (2 ** attempt))
+                    continue
+                if response.status >= 400:
+                    raise _http_error(url, response.status)
+                return await response.json()
+
+async def _get_sprint_issues_page(sprint_id, start_at, include_changelog=False):
+    url = f"{jira_api.URL}/rest/agile/1.0/sprint/{sprint_id}/issue"
+    return await _get(url, params=jira_api._sprint_issues_params(start_at, include_changelog))
+
+async def get_issues_in_sprint(sprint_id, include_changelog=False):
+    first_page = await _get_sprint_issues_page(sprint_id, 0, include_changelog)
+    issues = list(first_page['issues'])
+    pages = await asyncio.gather(*(
+        _get_sprint_issues_page(sprint_id, start_at, include_changelog)
+        for start_at in jira_api._remaining_page_offsets(first_page)
+    ))
+    for page in pages:
+        issues.extend(page['issues'])
+    return jira_api._normalize_issues(issues)
+
+async def get_worklogs(issue_id):
+    data = await _get(f"{jira_api.URL}/rest/api/3/issue/{issue_id}/worklog")
+    return jira_api._normalize_worklogs(data['worklogs'])
+
+async def get_worklogs_for_issues(issue_ids):
+    results = await asyncio.gather(*(get_worklogs(issue_id) for issue_id in issue_ids))
+    return dict(zip(issue_ids, results))
+
+def close():
+    """Cierra la sesión HTTP y detiene el event loop compartido."""
+    global _loop, _session
+    with _loop_lock:
+        if _loop is None:
+            return
+        if _session is not None and not _session.closed:
+            asyncio.run_coroutine_threadsafe(_session.close(), _loop).result()
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop = None
+        _session = None
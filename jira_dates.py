@@ -0,0 +1,66 @@
+"""
+Parseo rápido de las fechas que devuelve Jira.
+
+Jira usa ISO 8601 con milisegundos y offset sin dos puntos
+(`2024-01-03T10:00:00.000-0300`). `datetime.fromisoformat` es mucho más rápido
+que `strptime`, pero en Python < 3.11 no acepta ese offset, así que se
+normaliza antes. Los resultados se cachean porque los mismos valores se
+repiten en worklogs y changelogs, y la zona horaria configurada se construye
+una sola vez. normalize_jira_timestamp lleva al mismo formato las fechas que
+algunos endpoints devuelven como epoch.
+"""
+from datetime import datetime
+from functools import lru_cache
+
+import pytz
+
+from config import TIMEZONE
+
+@lru_cache(maxsize=None)
+def get_timezone():
+    """Zona horaria configurada (pytz.timezone es costoso de construir)."""
+    return pytz.timezone(TIMEZONE)
+
+@lru_cache(maxsize=65536)
+def parse_jira_datetime(value):
+    """Fecha de Jira con zona horaria (aware)."""
+    if not isinstance(value, str):
+        raise ValueError(f"Fecha de Jira inválida: {value!r}")
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    elif len(value) > 5 and value[-5] in '+-' and value[-3] != ':':
+        value = value[:-2] + ':' + value[-2:]
+    return datetime.fromisoformat(value)
+
+@lru_cache(maxsize=65536)
+def parse_jira_local(value):
+    """
+    Fecha de Jira como hora local sin offset (naive), descartando milisegundos
+    y zona: equivale a strptime(value.split('.')[0], '%Y-%m-%dT%H:%M:%S').
+    """
+    if not isinstance(value, str):
+        raise ValueError(f"Fecha de Jira inválida: {value!r}")
+    return datetime.fromisoformat(value[:19])
+
+def normalize_jira_timestamp(value):
+    """
+    Fecha de Jira en formato ISO (`2024-01-03T10:00:00.000-0300`). Algunos
+    endpoints (p. ej. /changelog/bulkfetch) pueden devolver epoch en
+    milisegundos, como número o texto: se convierte a la zona horaria
+    configurada. Lanza ValueError si el valor no es ninguna de las dos formas.
+    """
+    if isinstance(value, str) and not value.lstrip('-').isdigit():
+        parse_jira_datetime(value)
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Fecha de Jira inválida: {value!r}")
+    date = datetime.fromtimestamp(int(value) / 1000, tz=get_timezone())
+    return date.strftime('%Y-%m-%dT%H:%M:%S.') + f"{date.microsecond // 1000:03d}" + date.strftime('%z')
+
+def parse_jira_epoch(value):
+    """Fecha de Jira como segundos epoch, para comparar rangos sin convertir zonas."""
+    return parse_jira_datetime(value).timestamp()
+
+def to_configured_tz(value):
+    """Convierte una fecha de Jira a la zona horaria configurada."""
+    return parse_jira_datetime(value).astimezone(get_timezone())
@@ -0,0 +1,96 @@
+"""
+Caché en memoria con TTL y desalojo LRU para metadatos de Jira
+(proyectos, tableros, sprints).
+
+Cada función decorada con `ttl_cache` tiene su propia caché acotada, con su
+TTL y contadores de aciertos/fallos consultables vía `get_stats()`.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+_caches = {}
+
+class TTLCache:
+    def __init__(self, name, ttl, maxsize):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Devuelve (True, valor) si hay una entrada vigente, (False, None) si no."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+def create_cache(name, ttl, maxsize=128):
+    """Crea una caché con nombre, incluida en las estadísticas de get_stats()."""
+    cache = TTLCache(name, ttl, maxsize)
+    _caches[name] = cache
+    return cache
+
+def ttl_cache(name, ttl, maxsize=128):
+    """
+    Decorador que cachea el resultado de la función según sus argumentos.
+    Se devuelven copias para que los llamadores puedan modificar el resultado
+    sin alterar la entrada cacheada.
+    """
+    cache = create_cache(name, ttl, maxsize)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            return copy.deepcopy(value)
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+def get_stats():
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+def clear_all():
+    for cache in _caches.values():
+        cache.clear()
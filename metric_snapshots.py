@@ -0,0 +1,92 @@
+"""
+Instantáneas persistentes de las métricas de sprints cerrados.
+
+Una vez cerrado el sprint, sus métricas (resumen, comparativa, velocidad,
+burndown...) ya no cambian: se calculan una vez, en el primer acceso, y se
+guardan en disco junto con la revisión del código de métricas que las
+produjo. Mientras esa revisión no cambie se sirven directamente, sin consultar
+Jira. Al cambiar las reglas de cálculo se incrementa METRICS_REVISION en
+sprint_metrics y las instantáneas anteriores dejan de usarse.
+
+Quien ya conoce la versión de datos actual del sprint (p. ej. las
+exportaciones, que la usan para el ETag) la pasa a load(): si Jira tuvo una
+corrección posterior, la instantánea no se usa y se vuelve a calcular.
+"""
+import json
+import os
+import tempfile
+import threading
+
+from memory_cache import create_cache
+from sprint_cache import CACHE_DIR
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'metric_snapshots')
+
+# Instantáneas ya leídas de disco, para no parsear el JSON en cada petición
+_snapshots = create_cache('metric_snapshots', ttl=3600, maxsize=64)
+_lock = threading.Lock()
+
+def _path(sprint_id):
+    return os.path.join(SNAPSHOT_DIR, f"{int(sprint_id)}.json")
+
+def _load_entry(sprint_id, revision, memoize):
+    key = (int(sprint_id), revision)
+    found, entry = _snapshots.get(key)
+    if found:
+        return entry
+    try:
+        with open(_path(sprint_id), 'r', encoding='utf-8') as fh:
+            entry = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if entry.get('revision') != revision:
+        return None
+    if memoize:
+        _snapshots.set(key, entry)
+    return entry
+
+def load(sprint_id, revision, memoize=True, data_version=None):
+    """
+    Devuelve las métricas guardadas del sprint si son de la misma revisión, o
+    None. Con data_version (versión actual en Jira) una instantánea tomada con
+    otra versión también cuenta como ausente: hay que recalcularla.
+    """
+    entry = _load_entry(sprint_id, revision, memoize)
+    if not entry:
+        return None
+    if data_version is not None and entry.get('version') != data_version:
+        return None
+    return entry.get('metrics')
+
+def save(sprint_id, revision, data_version, metrics):
+    """Guarda la instantánea de forma atómica (archivo temporal + rename)."""
+    entry = {
+        'revision': revision,
+        'sprint_id': int(sprint_id),
+        'version': data_version,
+        'metrics': metrics,
+    }
+    with _lock:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                json.dump(entry, fh)
+            os.replace(tmp_path, _path(sprint_id))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # Una instantánea reemplazada no debe seguir sirviéndose desde memoria
+        key = (int(sprint_id), revision)
+        found, _ = _snapshots.get(key)
+        if found:
+            _snapshots.set(key, entry)
+
+def invalidate(sprint_id):
+    """Descarta la instantánea del sprint (p. ej. tras corregir datos en Jira)."""
+    _snapshots.clear()
+    try:
+        os.remove(_path(sprint_id))
+    except OSError:
+        pass
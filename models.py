@@ -0,0 +1,136 @@
+"""
+Modelo interno compacto de issues y worklogs.
+
+El JSON de Jira trae por cada issue decenas de claves anidadas (iconos, URLs,
+avatares, campos personalizados) que las métricas no usan. Al recibir los
+datos se construye una sola vez un `Issue` con `__slots__` que conserva solo lo
+necesario: los nombres de estado, tipo, responsable y autor se internan (todas
+las issues del sprint comparten la misma cadena) y las fechas y transiciones
+del changelog quedan ya parseadas.
+
+El JSON crudo sigue siendo el formato de la caché en disco y de la ruta de
+detalle del sprint, que lo devuelve tal cual al frontend.
+"""
+import sys
+from typing import NamedTuple
+
+from jira_dates import parse_jira_local
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _local_datetime(value):
+    if not value:
+        return None
+    try:
+        return parse_jira_local(value)
+    except ValueError:
+        return None
+
+def _sprint_ids(value):
+    """El campo Sprint del changelog trae los ids como texto: '12, 13'."""
+    if not value:
+        return frozenset()
+    return frozenset(part.strip() for part in str(value).split(',') if part.strip())
+
+class StatusTransition(NamedTuple):
+    """Cambio de un campo en el changelog (estado, tipo o sprints), en hora local de Jira."""
+    when: object
+    from_value: object
+    to_value: object
+
+class Worklog:
+    __slots__ = ('id', 'author', 'started', 'hours')
+
+    def __init__(self, id, author, started, hours):
+        self.id = id
+        self.author = author
+        self.started = started
+        self.hours = hours
+
+    @classmethod
+    def from_jira(cls, worklog):
+        author = worklog.get('author') or {}
+        return cls(
+            worklog.get('id'),
+            _intern(author.get('displayName', '')),
+            worklog.get('started', ''),
+            worklog.get('timeSpentHours', 0),
+        )
+
+class Issue:
+    __slots__ = (
+        'id', 'key', 'summary', 'issue_type', 'status', 'assignee', 'priority',
+        'story_points', 'created', 'resolved', 'parent_summary', 'worklogs',
+        'status_changes', 'type_changes', 'sprint_changes', 'time_spent', '_timeline',
+    )
+
+    def __init__(self, id, key, summary, issue_type, status, assignee='', priority=None,
+                 story_points=0.0, created=None, resolved=None, parent_summary='', worklogs=(),
+                 status_changes=(), type_changes=(), sprint_changes=()):
+        self.id = id
+        self.key = key
+        self.summary = summary
+        self.issue_type = _intern(issue_type)
+        self.status = _intern(status)
+        self.assignee = _intern(assignee)
+        self.priority = _intern(priority)
+        self.story_points = story_points
+        self.created = created
+        self.resolved = resolved
+        self.parent_summary = parent_summary
+        self.worklogs = tuple(worklogs)
+        self.status_changes = tuple(status_changes)
+        self.type_changes = tuple(type_changes)
+        self.sprint_changes = tuple(sprint_changes)
+        # Worklogs ya filtrados al período del sprint
+        self.time_spent = sum(worklog.hours for worklog in self.worklogs)
+        self._timeline = None
+
+    @classmethod
+    def from_jira(cls, issue):
+        """Construye el modelo a partir del issue de Jira (con worklogs y, opcionalmente, changelog)."""
+        fields = issue['fields']
+        assignee = fields.get('assignee') or {}
+        priority = fields.get('priority') or {}
+        parent = fields.get('parent') or {}
+
+        status_changes = []
+        type_changes = []
+        sprint_changes = []
+        histories = issue.get('changelog', {}).get('histories', [])
+        for history in sorted(histories, key=lambda x: x.get('created', '')):
+            # Hora local de Jira sin offset, igual que las fechas de sprint
+            change_dt = _local_datetime(history.get('created'))
+            if change_dt is None:
+                continue
+            for item in history.get('items', []):
+                field = item.get('field')
+                if field == 'status':
+                    status_changes.append(StatusTransition(change_dt, _intern(item.get('fromString')), _intern(item.get('toString'))))
+                elif field == 'issuetype':
+                    type_changes.append(StatusTransition(change_dt, _intern(item.get('fromString')), _intern(item.get('toString'))))
+                elif field == 'Sprint':
+                    sprint_changes.append(StatusTransition(change_dt, _sprint_ids(item.get('from')), _sprint_ids(item.get('to'))))
+
+        return cls(
+            issue.get('id'),
+            issue['key'],
+            fields.get('summary', ''),
+            fields['issuetype']['name'],
+            fields['status']['name'],
+            assignee.get('displayName', ''),
+            priority.get('name'),
+            float(fields.get('story_points', 0) or 0),
+            _local_datetime(fields.get('created')),
+            _local_datetime(fields.get('resolutiondate')),
+            parent.get('fields', {}).get('summary', ''),
+            [Worklog.from_jira(worklog) for worklog in issue.get('worklogs', [])],
+            status_changes,
+            type_changes,
+            sprint_changes,
+        )
+
+def build_issues(raw_issues):
+    """Convierte la lista de issues de Jira al modelo interno."""
+    return [Issue.from_jira(issue) for issue in raw_issues]
@@ -0,0 +1,128 @@
+"""
+Limitador de tasa (token bucket) compartido para las llamadas a Jira.
+
+Además de la tasa configurada, obedece las señales que envía Jira:
+- `Retry-After`: pausa todas las llamadas durante los segundos indicados.
+- `X-RateLimit-Remaining: 0` + `X-RateLimit-Reset`: pausa hasta el reset.
+- `X-RateLimit-NearLimit: true`: vacía el bucket para frenar el ritmo.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.throttled = 0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def _try_acquire(self):
+        """Toma un token si hay; si no, devuelve los segundos a esperar."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return max(self._paused_until - now, (1 - self._tokens) / self.rate, 0.01)
+
+    def _set_waiting(self, delta):
+        with self._lock:
+            self.waiting += delta
+
+    def acquire(self):
+        """Bloquea hasta obtener un token (y hasta que termine cualquier pausa)."""
+        self._set_waiting(1)
+        try:
+            wait = self._try_acquire()
+            while wait:
+                time.sleep(wait)
+                wait = self._try_acquire()
+        finally:
+            self._set_waiting(-1)
+
+    async def acquire_async(self):
+        """Igual que acquire() pero cediendo el event loop mientras espera."""
+        import asyncio
+        self._set_waiting(1)
+        try:
+            wait = self._try_acquire()
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self._try_acquire()
+        finally:
+            self._set_waiting(-1)
+
+    def pause(self, seconds):
+        """Detiene todas las llamadas durante `seconds` segundos."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+            self.throttled += 1
+
+    def update_from_headers(self, headers):
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None:
+            self.pause(retry_after)
+            return
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset:
+            try:
+                if int(remaining) <= 0:
+                    self.pause(_seconds_until(reset))
+                    return
+            except ValueError:
+                pass
+
+        if str(headers.get('X-RateLimit-NearLimit', '')).lower() == 'true':
+            with self._lock:
+                self._tokens = 0
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'waiting': self.waiting,
+                'throttled': self.throttled,
+                'paused_for': round(max(0.0, self._paused_until - now), 2),
+            }
+
+def parse_retry_after(value):
+    """Retry-After puede venir en segundos o como fecha HTTP."""
+    if value is None or value == '':
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _seconds_until(reset):
+    """X-RateLimit-Reset llega como timestamp ISO 8601 (p.ej. 2024-01-01T10:00Z)."""
+    try:
+        reset_dt = datetime.fromisoformat(reset.replace('Z', '+00:00'))
+    except ValueError:
+        return 1.0
+    if reset_dt.tzinfo is None:
+        reset_dt = reset_dt.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_dt - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,55 @@
+"""
+Coalescencia de llamadas concurrentes idénticas ("single flight").
+
+Si varios hilos piden la misma clave a la vez, solo el primero ejecuta la
+función; el resto espera y recibe una copia del mismo resultado (o la misma
+excepción).
+"""
+import copy
+import threading
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.event.set()
+        # Con otros llamadores esperando, el líder también recibe una copia para
+        # que ninguna modificación posterior afecte a los demás
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,65 @@
+"""
+Caché persistente en disco para los issues de sprints cerrados.
+
+Guarda por sprint los issues normalizados junto con sus worklogs ya filtrados
+(la salida de get_issues_with_details), en dos variantes: 'lean' (sin
+changelog) y 'changelog' (con el historial de cambios expandido). Cada entrada lleva la versión de datos
+del sprint (cantidad de issues y máximo `updated`), de modo que cualquier
+cambio en Jira invalida la entrada.
+"""
+import json
+import os
+import tempfile
+import threading
+
+import config
+
+CACHE_DIR = getattr(config, 'CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+SPRINT_CACHE_DIR = os.path.join(CACHE_DIR, 'sprints')
+
+# Incrementar si cambia la forma de los datos guardados
+CACHE_FORMAT_VERSION = 3
+
+_lock = threading.Lock()
+
+def _path(sprint_id, variant):
+    return os.path.join(SPRINT_CACHE_DIR, f"{int(sprint_id)}-{variant}.json")
+
+def load(sprint_id, data_version, variant='lean'):
+    """Devuelve los issues cacheados si la versión coincide, o None."""
+    path = _path(sprint_id, variant)
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            entry = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if entry.get('format') != CACHE_FORMAT_VERSION or entry.get('version') != data_version:
+        return None
+    return entry.get('issues')
+
+def save(sprint_id, data_version, issues, variant='lean'):
+    """Guarda los issues del sprint de forma atómica (archivo temporal + rename)."""
+    entry = {
+        'format': CACHE_FORMAT_VERSION,
+        'sprint_id': int(sprint_id),
+        'version': data_version,
+        'issues': issues,
+    }
+    with _lock:
+        os.makedirs(SPRINT_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=SPRINT_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                json.dump(entry, fh)
+            os.replace(tmp_path, _path(sprint_id, variant))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+def invalidate(sprint_id):
+    for variant in ('lean', 'changelog'):
+        try:
+            os.remove(_path(sprint_id, variant))
+        except OSError:
+            pass
@@ -0,0 +1,378 @@
+"""
+Motor único de métricas por sprint.
+
+Todas las rutas de métricas (avanzadas, velocidad, resumen, sprint activo,
+comparativas y análisis descargable) leen de `get_sprint_metrics()`, que
+calcula en una sola pasada sobre la tabla columnar del sprint cada agregado
+que esas rutas necesitan, con sus reglas particulares:
+
+- estado *actual* del issue (velocidad, resumen, sprint activo, métricas
+  avanzadas) o estado *al cierre del sprint* según el changelog
+  (comparativas y análisis);
+- Story/Task como comprometidos, Bug/Support con sus tiempos de resolución.
+
+El resultado se memoiza por sprint y versión de datos en Jira, de modo que
+abrir varias páginas del mismo sprint cuesta un solo recorrido de sus issues;
+los sprints cerrados quedan además como instantánea en disco
+(metric_snapshots) y se sirven sin volver a Jira. Las rutas que solo usan el
+estado actual (velocidad, resumen) piden la variante sin changelog
+(changelog=False), que descarga los issues sin expandir su historial y
+calcula solo CURRENT_STATE_SECTIONS.
+Las rutas que abarcan varios sprints los cargan en paralelo con
+`get_many_sprint_metrics()`.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+
+import config
+import metric_snapshots
+from burndown import build_burndown
+from jira_api import get_sprint_details, get_sprint_data_version, get_sprint_issues
+from memory_cache import create_cache
+from single_flight import SingleFlight
+from sprint_table import Categorical, SprintTable, group_count, group_sum, mean
+
+# Revisión del cálculo de métricas: incrementarla al cambiar cualquier regla de
+# este módulo (o de sprint_table/burndown) invalida las instantáneas guardadas
+METRICS_REVISION = 1
+
+# TTL de los resultados memoizados; la clave ya incluye la versión de datos
+METRICS_CACHE_TTL = getattr(config, 'METRICS_CACHE_TTL', 3600)
+
+# Sprints que se cargan a la vez en todo el proceso. Es un pool propio y no el
+# de jira_api porque cada carga encola a su vez páginas y worklogs en aquel.
+SPRINT_LOAD_WORKERS = getattr(config, 'SPRINT_LOAD_WORKERS', 4)
+
+_metrics_cache = create_cache('sprint_metrics', ttl=METRICS_CACHE_TTL, maxsize=64)
+_metrics_flight = SingleFlight()
+_sprint_executor = ThreadPoolExecutor(max_workers=SPRINT_LOAD_WORKERS, thread_name_prefix='sprint-load')
+
+# Estados finales según el estado actual del issue (mayúsculas)
+DONE_STATUSES = ['DONE', 'CLOSED', 'FOR RELEASE']
+# Estados que cuentan como finalizados al cierre del sprint
+COMPLETED_AT_CLOSE = ['Done', 'For Release', 'CODE REVIEW']
+
+TIME_DISTRIBUTION_MAPPING = {
+    'TO DO': 'planning',
+    'TODO': 'planning',
+    'IN PROGRESS': 'development',
+    'CODE REVIEW': 'completed',
+    'FOR RELEASE': 'completed',
+    'DONE': 'completed',
+}
+TIME_DISTRIBUTION_CATEGORIES = ['planning', 'development', 'review', 'testing', 'completed', 'other']
+
+# Secciones que dependen solo del estado actual: se calculan sin changelog
+CURRENT_STATE_SECTIONS = ('totals', 'velocity', 'time_distribution', 'average_task_completion', 'team_performance', 'summary')
+
+def analyze_story_points_vs_time(story_points, time_spent):
+    if story_points is None or story_points == 0:
+        return ""
+
+    # Definir rangos de horas para cada punto
+    ranges = {
+        1: (0, 2),
+        2: (2, 4),
+        3: (4, 8),
+        5: (8, 16),
+        8: (16, 24)
+    }
+
+    expected_range = ranges.get(story_points)
+    if expected_range is None:
+        return ""
+
+    if time_spent < expected_range[0]:
+        return "Sobre-estimado"
+    elif time_spent > expected_range[1]:
+        return "Sub-estimado"
+    else:
+        return "Correcto"
+
+def get_sprint_end_datetime(sprint_details):
+    """Fin del sprint con la hora de cierre ajustada a las 23:59:59 (o None)."""
+    sprint_end = sprint_details.get('endDate')
+    if not sprint_end:
+        return None
+    sprint_end_date = datetime.strptime(sprint_end, '%Y-%m-%d %H:%M:%S').date()
+    return datetime.combine(sprint_end_date, datetime.max.time().replace(hour=23, minute=59, second=59, microsecond=0))
+
+def format_creation_date(issue):
+    """Fecha de creación del issue en formato legible ('' si no la tiene)."""
+    return issue.created.strftime('%Y-%m-%d %H:%M:%S') if issue.created else ''
+
+def _rename_missing(distribution, label):
+    """Reemplaza la clave None (campo sin valor en Jira) por una etiqueta legible."""
+    return {label if key is None else key: count for key, count in distribution.items()}
+
+def _time_distribution(table):
+    """Horas registradas agrupadas por la etapa que corresponde al estado actual."""
+    distribution = dict.fromkeys(TIME_DISTRIBUTION_CATEGORIES, 0)
+    for status, hours in group_sum(table.status, table.hours).items():
+        distribution[TIME_DISTRIBUTION_MAPPING.get(status.upper(), 'other')] += hours
+    # Solo incluir categorías con horas > 0
+    return {k: v for k, v in distribution.items() if v > 0}
+
+def _team_performance(issues):
+    """Horas y cantidad de worklogs por autor, con el promedio por worklog."""
+    authors = Categorical([worklog.author for issue in issues for worklog in issue.worklogs])
+    hours = np.fromiter((worklog.hours for issue in issues for worklog in issue.worklogs), dtype=float)
+    counts = group_count(authors)
+    return {
+        author: {
+            'total_hours': total,
+            'tasks_count': counts[author],
+            'avg_hours_per_task': total / counts[author]
+        }
+        for author, total in group_sum(authors, hours).items()
+    }
+
+def _issue_group(table, issue_type, done, missing_label, key):
+    """Creados, resueltos, distribución por prioridad y tiempo medio de resolución de un tipo."""
+    mask = table.issue_type.isin([issue_type])
+    return {
+        'created': int(mask.sum()),
+        'resolved': int((mask & done).sum()),
+        key: _rename_missing(group_count(table.priority, mask), missing_label),
+        'avg_resolution_days': mean(table.resolution_days(mask & done))
+    }
+
+def compute_sprint_metrics(sprint_details, issues, now=None, changelog=True):
+    """
+    Calcula todos los agregados del sprint a partir de sus issues (modelo
+    `models.Issue`, con changelog). Devuelve un dict por sección:
+    `totals`, `velocity`, `time_distribution`, `average_task_completion`,
+    `team_performance`, `summary`, `comprehensive` y `burndown`. Con
+    changelog=False (issues sin historial) solo CURRENT_STATE_SECTIONS.
+    """
+    # Sin changelog no hay estado al cierre: las columnas quedan con el actual
+    sprint_end_dt = get_sprint_end_datetime(sprint_details) if changelog else None
+    table = SprintTable(issues, sprint_end_dt)
+
+    # Máscaras compartidas por todas las secciones
+    done = table.status.matches(lambda status: status.upper() in DONE_STATUSES)
+    completed = table.status_at_close.isin(COMPLETED_AT_CLOSE)
+    story_or_task = table.issue_type.isin(['Story', 'Task'])
+    estimated = story_or_task & (table.points != 0)
+
+    # Totales con el estado actual (sprint activo y velocidad)
+    totals = {
+        'total_issues': len(table),
+        'issues_by_type': group_count(table.issue_type),
+        'issues_by_status': group_count(table.status),
+        'story_points': {
+            'total': float(table.points.sum()),
+            'completed': float(table.points[done].sum())
+        }
+    }
+
+    # Velocidad: Story y Task estimadas (Support, Bug y Spike no se estiman en puntos)
+    velocity = {
+        'committed_points': float(table.points[estimated].sum()),
+        'completed_points': float(table.points[estimated & done].sum()),
+        'total_stories': int(estimated.sum()),
+        'completed_stories': int((estimated & done).sum()),
+        'story_details': []
+    }
+
+    # Resumen: comprometidos son todas las Story y Task, estimadas o no
+    committed_points = float(table.points[story_or_task].sum())
+    completed_summary_points = float(table.points[story_or_task & done].sum())
+    summary = {
+        'committed_points': committed_points,
+        'completed_points': completed_summary_points,
+        'say_do_ratio': (completed_summary_points / committed_points * 100) if committed_points > 0 else 0,
+        'issue_type_distribution': totals['issues_by_type'],
+        'bugs': _issue_group(table, 'Bug', done, 'Sin severidad', 'severity'),
+        'support': _issue_group(table, 'Support', done, 'Sin prioridad', 'priority')
+    }
+
+    metrics = {
+        'totals': totals,
+        'velocity': velocity,
+        'time_distribution': _time_distribution(table),
+        'average_task_completion': mean(table.resolution_days(table.status.isin(['Done', 'Closed']))),
+        'team_performance': _team_performance(issues),
+        'summary': summary
+    }
+    if not changelog:
+        for index, issue in enumerate(issues):
+            if estimated[index]:
+                velocity['story_details'].append(_story_detail(issue, table, done, index))
+        return metrics
+
+    # Comparativas: estado y tipo vigentes al cierre del sprint
+    assigned = table.assignee.matches(bool)
+    hours_by_dev = group_sum(table.assignee, table.hours, assigned)
+    points_by_dev = group_sum(table.assignee, table.points, assigned & completed)
+    tasks_by_dev = group_count(table.assignee, assigned & completed)
+    comprehensive = {
+        'id': sprint_details['id'],
+        'name': sprint_details['name'],
+        'start_date': sprint_details.get('startDate'),
+        'end_date': sprint_details.get('endDate'),
+        'completed_points': float(table.points[completed].sum()),
+        # Puntos estimados totales (solo para Task y Story, excluyendo Support, Bug y Spike)
+        'estimated_points': float(table.points[story_or_task & (table.points > 0)].sum()),
+        # Worklogs ya filtrados por sprint
+        'total_hours': float(table.hours.sum()),
+        'issue_type_distribution': group_count(table.type_at_close),
+        # Distribución por tipo SOLO de issues finalizadas al cierre del sprint
+        'completed_issue_type_distribution': group_count(table.type_at_close, completed),
+        'individual_metrics': [
+            {
+                'developer': developer,
+                'completed_points': points_by_dev.get(developer, 0),
+                'total_hours': total,
+                'completed_tasks': tasks_by_dev.get(developer, 0)
+            }
+            for developer, total in hours_by_dev.items()
+        ],
+        'detailed_issues': [],
+        'estimation_analysis': []
+    }
+
+    # Única pasada por fila para las salidas que son por issue
+    status_codes = table.status_at_close.codes
+    status_labels = table.status_at_close.labels
+    for index, issue in enumerate(issues):
+        story_points = float(table.points[index])
+        time_spent = float(table.hours[index])
+        if estimated[index]:
+            velocity['story_details'].append(_story_detail(issue, table, done, index))
+
+        analysis = analyze_story_points_vs_time(story_points, time_spent) if completed[index] else ""
+        if completed[index]:
+            comprehensive['estimation_analysis'].append({
+                'issue_key': issue.key,
+                'story_points': story_points,
+                'time_spent': time_spent,
+                'analysis': analysis
+            })
+        comprehensive['detailed_issues'].append({
+            'issue_type': issue.issue_type,
+            'issue_key': issue.key,
+            'summary': issue.summary,
+            'assignee': issue.assignee,
+            'status': status_labels[status_codes[index]],
+            'time_spent': time_spent,
+            'story_points': story_points,
+            'story_points_analysis': analysis,
+            'parent_summary': issue.parent_summary,
+            'fecha_creacion': format_creation_date(issue)
+        })
+
+    metrics['comprehensive'] = comprehensive
+    metrics['burndown'] = build_burndown(sprint_details, issues, now)
+    return metrics
+
+def _story_detail(issue, table, done, index):
+    story_points = float(table.points[index])
+    return {
+        'key': issue.key,
+        'summary': issue.summary,
+        'type': issue.issue_type,
+        'status': issue.status,
+        'committed_points': story_points,
+        'completed_points': story_points if done[index] else 0,
+        'completed': bool(done[index])
+    }
+
+def _compute(sprint_id, sprint_details, changelog, data_version):
+    issues = get_sprint_issues(sprint_id, include_changelog=changelog, data_version=data_version)
+    return compute_sprint_metrics(sprint_details, issues, changelog=changelog)
+
+def get_sprint_metrics(sprint_id, memoize=True, changelog=True, data_version=None):
+    """
+    Métricas del sprint memoizadas por versión de datos en Jira. El resultado
+    es compartido entre peticiones: los llamadores no deben modificarlo. Con
+    memoize=False se reutiliza una entrada existente pero no se guarda la
+    nueva (recorridos largos que no deben desalojar la caché).
+
+    Con changelog=False solo se garantizan CURRENT_STATE_SECTIONS (se
+    devuelve el cálculo completo si ya está disponible). Un sprint cerrado
+    siempre se calcula completo, para guardar su instantánea y no volver a
+    Jira en los próximos accesos. data_version evita
+    volver a consultarla si el llamador ya la tiene (p. ej. por el ETag).
+    """
+    # Sprint cerrado con instantánea de esta revisión: se sirve sin consultar Jira
+    # (si el llamador trae la versión actual, solo si la instantánea es de esa versión)
+    metrics = metric_snapshots.load(sprint_id, METRICS_REVISION, memoize, data_version)
+    if metrics is not None:
+        return metrics
+
+    sprint_details = get_sprint_details(sprint_id)
+    if data_version is None:
+        data_version = get_sprint_data_version(sprint_id)
+    closed = sprint_details.get('state', '').upper() == 'CLOSED'
+    if closed:
+        changelog = True
+    full_key = (int(sprint_id), data_version, 'full')
+    if not closed:
+        # El burndown de un sprint abierto avanza con los días aunque los datos no cambien
+        full_key += (date.today(),)
+    # La variante sin changelog también se sirve del cálculo completo si ya está
+    found, metrics = _metrics_cache.get(full_key)
+    key = full_key if changelog else (int(sprint_id), data_version, 'current')
+    if not found and not changelog:
+        found, metrics = _metrics_cache.get(key)
+    if not found:
+        metrics = _metrics_flight.do(key, _compute, sprint_id, sprint_details, changelog, data_version)
+        if memoize:
+            _metrics_cache.set(key, metrics)
+    if closed:
+        metric_snapshots.save(sprint_id, METRICS_REVISION, data_version, metrics)
+    return metrics
+
+def refresh_sprint_metrics(sprint_id):
+    """Descarta la instantánea del sprint y vuelve a calcular sus métricas."""
+    metric_snapshots.invalidate(sprint_id)
+    return get_sprint_metrics(sprint_id)
+
+def get_many_sprint_metrics(sprint_ids, changelog=True):
+    """
+    Métricas de varios sprints cargados en paralelo. Devuelve `(results,
+    errors)`: `results` en el mismo orden que `sprint_ids`, con None para los
+    sprints que fallaron, y `errors` con `{'sprint_id', 'error'}` por cada uno.
+    """
+    results = []
+    errors = []
+    for sprint_id, metrics, error in iter_sprint_metrics(sprint_ids, changelog=changelog):
+        results.append(metrics)
+        if error is not None:
+            errors.append({'sprint_id': sprint_id, 'error': error})
+    return results, errors
+
+def iter_sprint_metrics(sprint_ids, memoize=True, changelog=True, versions=None):
+    """
+    Recorre las métricas de los sprints en orden, cargando en paralelo solo
+    una ventana de SPRINT_LOAD_WORKERS sprints: en memoria nunca hay más que
+    esa ventana, sin importar cuántos sprints se recorran. Produce
+    `(sprint_id, metrics, error)`, con metrics None si el sprint falló.
+    `versions` ({sprint_id: versión de datos}) evita volver a consultarlas.
+    """
+    sprint_ids = iter(sprint_ids)
+    versions = versions or {}
+    window = deque()
+
+    def submit_next():
+        for sprint_id in sprint_ids:
+            future = _sprint_executor.submit(
+                get_sprint_metrics, sprint_id, memoize, changelog, versions.get(int(sprint_id))
+            )
+            window.append((sprint_id, future))
+            return
+
+    for _ in range(SPRINT_LOAD_WORKERS):
+        submit_next()
+    while window:
+        sprint_id, future = window.popleft()
+        submit_next()
+        try:
+            yield sprint_id, future.result(), None
+        except Exception as e:
+            print(f"Error loading sprint {sprint_id}: {str(e)}")
+            yield sprint_id, None, str(e)
@@ -0,0 +1,93 @@
+"""
+Representación columnar de los issues de un sprint para calcular métricas
+con operaciones vectorizadas (NumPy) en lugar de recorrerlos issue por issue.
+
+Las columnas categóricas (tipo, estado, responsable, prioridad) se codifican
+como enteros con su lista de etiquetas, de modo que las agrupaciones son un
+`np.bincount`. Las columnas numéricas (puntos, horas, fechas en segundos) son
+arrays de float, con NaN para fechas ausentes.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from issue_timeline import get_timeline
+
+_EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+class Categorical:
+    """Columna categórica: códigos enteros + etiquetas en orden de aparición."""
+    __slots__ = ('codes', 'labels')
+
+    def __init__(self, values):
+        index = {}
+        codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64, count=len(values))
+        self.codes = codes
+        self.labels = list(index)
+
+    def isin(self, values):
+        """Máscara de filas cuyo valor está en `values`."""
+        wanted = [code for code, label in enumerate(self.labels) if label in values]
+        return np.isin(self.codes, wanted)
+
+    def matches(self, predicate):
+        """Máscara de filas cuya etiqueta cumple `predicate`."""
+        wanted = [code for code, label in enumerate(self.labels) if predicate(label)]
+        return np.isin(self.codes, wanted)
+
+def _group_order(codes):
+    """Códigos presentes en orden de primera aparición."""
+    unique, first_index = np.unique(codes, return_index=True)
+    return unique[np.argsort(first_index)]
+
+def group_count(column, mask=None):
+    """{etiqueta: cantidad de filas} para las filas seleccionadas."""
+    codes = column.codes if mask is None else column.codes[mask]
+    counts = np.bincount(codes, minlength=len(column.labels))
+    return {column.labels[code]: int(counts[code]) for code in _group_order(codes)}
+
+def group_sum(column, values, mask=None):
+    """{etiqueta: suma de `values`} para las filas seleccionadas."""
+    codes = column.codes if mask is None else column.codes[mask]
+    weights = values if mask is None else values[mask]
+    sums = np.bincount(codes, weights=weights, minlength=len(column.labels))
+    return {column.labels[code]: float(sums[code]) for code in _group_order(codes)}
+
+def _seconds(value):
+    if value is None:
+        return np.nan
+    return (value - _EPOCH).total_seconds()
+
+class SprintTable:
+    """
+    Issues de un sprint en columnas. Con `sprint_end_dt` se agregan el estado
+    y el tipo vigentes al cierre del sprint (desde el changelog).
+    """
+
+    def __init__(self, issues, sprint_end_dt=None):
+        count = len(issues)
+        self.keys = [issue.key for issue in issues]
+        self.issue_type = Categorical([issue.issue_type for issue in issues])
+        self.status = Categorical([issue.status for issue in issues])
+        self.assignee = Categorical([issue.assignee for issue in issues])
+        self.priority = Categorical([issue.priority for issue in issues])
+        self.points = np.fromiter((issue.story_points for issue in issues), dtype=float, count=count)
+        self.hours = np.fromiter((issue.time_spent for issue in issues), dtype=float, count=count)
+        self.created = np.fromiter((_seconds(issue.created) for issue in issues), dtype=float, count=count)
+        self.resolved = np.fromiter((_seconds(issue.resolved) for issue in issues), dtype=float, count=count)
+
+        timelines = [get_timeline(issue) for issue in issues]
+        self.status_at_close = Categorical([timeline.status_at(sprint_end_dt) for timeline in timelines])
+        self.type_at_close = Categorical([timeline.type_at(sprint_end_dt) for timeline in timelines])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def resolution_days(self, mask):
+        """Días enteros entre creación y resolución (>= 0) de las filas seleccionadas."""
+        days = np.floor((self.resolved[mask] - self.created[mask]) / SECONDS_PER_DAY)
+        return days[~np.isnan(days) & (days >= 0)]
+
+def mean(values):
+    return float(values.mean()) if len(values) else 0
@@ -93,6 +93,14 @@ document.addEventListener('DOMContentLoaded', function() {
                         borderColor: '#4CAF50',
                         tension: 0.1,
                         fill: false
+                    },
+                    {
+                        label: 'Scope',
+                        data: (burndownData.scope || []).map(d => d.points),
+                        borderColor: '#9E9E9E',
+                        borderDash: [2, 2],
+                        stepped: true,
+                        fill: false
                     }
                 ]
             },
@@ -44,6 +44,12 @@ $(document).ready(function() {
         }
     });
 
+    $('#download-comparative-parquet').click(function() {
+        if (selectedSprints.length > 0) {
+            downloadComparativeAnalysis('parquet');
+        }
+    });
+
     function loadProjects() {
         $.get('/api/projects', function(projects) {
             const select = $('#project-select');
@@ -163,6 +169,10 @@ $(document).ready(function() {
         }), function(data) {
             analysisData = data;
             $('#analysis-progress').hide();
+            // Sprints que no se pudieron cargar: se analiza el resto
+            (data.errors || []).forEach(e => {
+                M.toast({html: `Sprint ${e.sprint_id} no incluido: ${e.error}`, classes: 'orange'});
+            });
             renderAnalysis(data);
         }).fail(function() {
             $('#analysis-progress').hide();
@@ -1064,11 +1074,66 @@ $(document).ready(function() {
     }
 
     function downloadComparativeAnalysis(format) {
+        if (format === 'xlsx') {
+            // El Excel se genera en segundo plano: se muestra el progreso y se descarga al terminar
+            startComparativeExport();
+            return;
+        }
         const sprintIds = selectedSprints.join(',');
-        const url = format === 'xlsx' 
-            ? `/api/metrics/comparative/download_xlsx?sprint_ids=${sprintIds}`
+        window.location.href = format === 'parquet'
+            ? `/api/metrics/comparative/download_columnar?sprint_ids=${sprintIds}`
             : `/api/metrics/comparative/download_csv?sprint_ids=${sprintIds}`;
-        
-        window.location.href = url;
+    }
+
+    function startComparativeExport() {
+        $('#download-comparative-xlsx').prop('disabled', true);
+        updateExportProgress({sprints_total: selectedSprints.length, sprints_loaded: 0, rows_written: 0, rows_total: 0});
+        $('#export-progress').show();
+
+        $.ajax({
+            url: '/api/metrics/comparative/export_jobs',
+            type: 'POST',
+            contentType: 'application/json',
+            data: JSON.stringify({sprint_ids: selectedSprints})
+        }).done(function(job) {
+            pollExportJob(job.job_id);
+        }).fail(function(xhr) {
+            finishComparativeExport();
+            const error = (xhr.responseJSON && xhr.responseJSON.error) || 'Error al iniciar la exportación';
+            M.toast({html: error, classes: 'red'});
+        });
+    }
+
+    function pollExportJob(jobId) {
+        $.get(`/api/export_jobs/${jobId}`, function(job) {
+            updateExportProgress(job);
+            if (job.state === 'done') {
+                finishComparativeExport();
+                window.location.href = `/api/export_jobs/${jobId}/download`;
+            } else if (job.state === 'error') {
+                finishComparativeExport();
+                M.toast({html: `Error en la exportación: ${job.error}`, classes: 'red'});
+            } else {
+                setTimeout(() => pollExportJob(jobId), 1000);
+            }
+        }).fail(function() {
+            finishComparativeExport();
+            M.toast({html: 'Error al consultar el progreso de la exportación', classes: 'red'});
+        });
+    }
+
+    function updateExportProgress(job) {
+        // Primera mitad de la barra: carga de sprints; segunda mitad: escritura de filas
+        const loaded = job.sprints_total ? job.sprints_loaded / job.sprints_total : 0;
+        const written = job.rows_total ? job.rows_written / job.rows_total : 0;
+        $('#export-progress .determinate').css('width', `${Math.round((loaded + written) * 50)}%`);
+
+        const rows = job.rows_total ? `${job.rows_written}/${job.rows_total}` : job.rows_written;
+        $('#export-progress-text').text(`Sprints cargados: ${job.sprints_loaded}/${job.sprints_total} · Filas escritas: ${rows}`);
+    }
+
+    function finishComparativeExport() {
+        $('#export-progress').hide();
+        $('#download-comparative-xlsx').prop('disabled', false);
     }
 }); 
\ No newline at end of file
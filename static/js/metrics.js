@@ -19,9 +19,11 @@ document.addEventListener('DOMContentLoaded', function() {
         if (sprintId) {
             $('#download-analysis-xlsx').removeClass('disabled').attr('href', `/api/sprints/${sprintId}/analysis/download`);
             $('#download-analysis-csv').removeClass('disabled').attr('href', `/api/sprints/${sprintId}/analysis/download_csv`);
+            $('#download-analysis-parquet').removeClass('disabled').attr('href', `/api/sprints/${sprintId}/analysis/download_columnar`);
         } else {
             $('#download-analysis-xlsx').addClass('disabled').attr('href', '#');
             $('#download-analysis-csv').addClass('disabled').attr('href', '#');
+            $('#download-analysis-parquet').addClass('disabled').attr('href', '#');
         }
         loadMetrics();
     });
@@ -81,6 +83,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // Cargar datos históricos de velocidad usando el board_id actual
         $.get(`/api/metrics/velocity/${boardId}`, function(data) {
+            notifySprintErrors(data.errors);
             updateVelocityTrend(data);
         });
     }
@@ -90,8 +93,11 @@ document.addEventListener('DOMContentLoaded', function() {
         if (!boardId) return;
         $('.metrics-summary-dashboard').hide();
         $('#metrics-summary-progress').show();
-        $.get(`/api/metrics/summary/${boardId}`, function(summary) {
-            if (!summary || summary.length === 0) {
+        $.get(`/api/metrics/summary/${boardId}`, function(data) {
+            // Los sprints que no se pudieron cargar vienen con su error
+            notifySprintErrors((data || []).filter(s => s.error));
+            const summary = (data || []).filter(s => !s.error);
+            if (summary.length === 0) {
                 $('#metrics-summary-progress').hide();
                 return;
             }
@@ -107,6 +113,12 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    function notifySprintErrors(errors) {
+        (errors || []).forEach(e => {
+            M.toast({html: `No se pudo cargar ${e.sprint_name || 'el sprint ' + e.sprint_id}: ${e.error}`, classes: 'orange'});
+        });
+    }
+
     function renderSummaryTable(summary) {
         let html = `<table class="striped responsive-table"><thead><tr>
             <th>Sprint</th><th>Fechas</th><th>Comprometidos</th><th>Completados</th><th>Say/Do Ratio (%)</th><th>Bugs Creados</th><th>Bugs Resueltos</th><th>Prom. Resolución Bugs (días)</th><th>Support Creados</th><th>Support Resueltos</th><th>Prom. Resolución Support (días)</th>
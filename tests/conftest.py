@@ -0,0 +1,19 @@
+"""
+Configuración común de los tests: importan los módulos desde la raíz del
+proyecto y, si no hay config.py, usan config.example.py con la caché en un
+directorio temporal.
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+if not os.path.exists(os.path.join(ROOT, 'config.py')):
+    spec = importlib.util.spec_from_file_location('config', os.path.join(ROOT, 'config.example.py'))
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    config.CACHE_DIR = tempfile.mkdtemp(prefix='jirasprints-tests-')
+    sys.modules['config'] = config
@@ -0,0 +1,63 @@
+"""
+complete_changelogs con respuestas fijas de /changelog/bulkfetch: `created`
+llega como ISO o como epoch en milisegundos (entero o texto) y en todos los
+casos Issue.from_jira conserva el cambio de estado. Una fecha que no es
+ninguna de esas formas falla en lugar de descartar el historial.
+"""
+from datetime import datetime
+
+import pytest
+
+import jira_api
+from jira_dates import get_timezone
+from models import Issue
+
+CHANGE_AT = get_timezone().localize(datetime(2024, 1, 5, 15, 30, 0))
+CHANGE_AT_MS = int(CHANGE_AT.timestamp() * 1000)
+
+def _history(created, to_status):
+    return {
+        'id': str(created),
+        'created': created,
+        'items': [{'field': 'status', 'fromString': 'To Do', 'toString': to_status}],
+    }
+
+def _issue(issue_id):
+    return {
+        'id': issue_id,
+        'key': f"FIX-{issue_id}",
+        'fields': {
+            'summary': 'Fixture',
+            'issuetype': {'name': 'Story'},
+            'status': {'name': 'Done'},
+            'created': '2024-01-01T09:00:00.000-0300',
+        },
+        # expand=changelog truncado: total mayor que las entradas recibidas
+        'changelog': {'startAt': 0, 'maxResults': 0, 'total': 150, 'histories': []},
+    }
+
+class _FixtureResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+def _complete(monkeypatch, created):
+    response = {'issueChangeLogs': [{'issueId': '1', 'changeHistories': [_history(created, 'Done')]}]}
+    monkeypatch.setattr(jira_api, '_post', lambda url, payload: _FixtureResponse(response))
+    return jira_api.complete_changelogs([_issue('1')])
+
+@pytest.mark.parametrize('created', [
+    CHANGE_AT.strftime('%Y-%m-%dT%H:%M:%S.000%z'),
+    CHANGE_AT_MS,
+    str(CHANGE_AT_MS),
+], ids=['iso', 'epoch-ms', 'epoch-ms-str'])
+def test_bulkfetch_created_keeps_status_change(monkeypatch, created):
+    issue = Issue.from_jira(_complete(monkeypatch, created)[0])
+    changes = [(change.when, change.to_value) for change in issue.status_changes]
+    assert changes == [(CHANGE_AT.replace(tzinfo=None), 'Done')]
+
+def test_bulkfetch_invalid_created_raises(monkeypatch):
+    with pytest.raises(ValueError):
+        _complete(monkeypatch, '5 de enero')
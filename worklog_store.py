@@ -0,0 +1,209 @@
+"""
+Almacén local de worklogs, mantenido al día de forma incremental.
+
+Los worklogs de un issue se cargan una vez (desde el payload del issue o el
+endpoint de worklogs) y a partir de ahí solo se aplican los cambios que
+informa Jira en /worklog/updated y /worklog/deleted desde el cursor `since`.
+El estado se persiste en CACHE_DIR para sobrevivir reinicios.
+
+De cada worklog se guardan solo los campos que usa la aplicación (ver
+FIELDS), como tupla. El almacén conserva a lo sumo WORKLOG_STORE_MAX_ISSUES
+issues: al superarlo se descartan los usados hace más tiempo, que se vuelven a
+cargar completos si se piden otra vez. La escritura a disco se agrupa: save()
+reescribe el archivo como mucho cada WORKLOG_STORE_SAVE_INTERVAL segundos
+(salvo save(force=True), que se usa al salir del proceso).
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import config
+from sprint_cache import CACHE_DIR
+
+STORE_PATH = os.path.join(CACHE_DIR, 'worklogs.json')
+STORE_FORMAT_VERSION = 2
+WORKLOG_STORE_MAX_ISSUES = getattr(config, 'WORKLOG_STORE_MAX_ISSUES', 20000)
+WORKLOG_STORE_SAVE_INTERVAL = getattr(config, 'WORKLOG_STORE_SAVE_INTERVAL', 30)
+
+# Campos guardados de cada worklog, en el orden de la tupla
+FIELDS = ('id', 'issueId', 'author', 'authorAvatar', 'started', 'timeSpent', 'timeSpentSeconds', 'updated')
+
+def _compact(worklog, issue_id):
+    """Tupla de FIELDS; issue_id es la clave del issue en el almacén, no el del payload."""
+    author = worklog.get('author') or {}
+    return (
+        str(worklog['id']),
+        issue_id,
+        author.get('displayName', ''),
+        worklog.get('authorAvatar') or (author.get('avatarUrls') or {}).get('48x48'),
+        worklog.get('started', ''),
+        worklog.get('timeSpent', ''),
+        worklog.get('timeSpentSeconds', 0),
+        worklog.get('updated', ''),
+    )
+
+def _expand(entry):
+    """Worklog con la forma de la API de Jira (solo los campos guardados)."""
+    worklog = dict(zip(FIELDS, entry))
+    worklog['author'] = {'displayName': worklog['author']}
+    return worklog
+
+class WorklogStore:
+    def __init__(self, path=STORE_PATH, max_issues=WORKLOG_STORE_MAX_ISSUES,
+                 save_interval=WORKLOG_STORE_SAVE_INTERVAL):
+        self.path = path
+        self.max_issues = max_issues
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._worklogs = {}             # worklog_id -> tupla de FIELDS
+        self._by_issue = OrderedDict()  # issue_id -> set(worklog_id); solo issues cargados, del menos al más usado
+        self.since = None               # cursor en ms para /worklog/updated y /worklog/deleted
+        self.last_sync = 0.0
+        self.synced = True              # False si la última sincronización con Jira falló
+        self._last_save = 0.0
+        self._dirty = False
+
+    def get(self, issue_id):
+        """Worklogs del issue, o None si el issue todavía no se cargó."""
+        issue_id = str(issue_id)
+        with self._lock:
+            ids = self._by_issue.get(issue_id)
+            if ids is None:
+                return None
+            self._by_issue.move_to_end(issue_id)
+            entries = [self._worklogs[wid] for wid in ids]
+        return [_expand(entry) for entry in sorted(entries, key=lambda entry: entry[4])]
+
+    def _put(self, entry):
+        """Guarda la entrada; si el worklog estaba bajo otro issue, lo quita de ese."""
+        previous = self._worklogs.get(entry[0])
+        if previous is not None and previous[1] != entry[1]:
+            self._by_issue.get(previous[1], set()).discard(entry[0])
+        self._worklogs[entry[0]] = entry
+
+    def _drop(self, issue_id, ids):
+        for wid in ids:
+            entry = self._worklogs.get(wid)
+            if entry is not None and entry[1] == issue_id:
+                del self._worklogs[wid]
+
+    def _evict(self):
+        while len(self._by_issue) > self.max_issues:
+            issue_id, ids = self._by_issue.popitem(last=False)
+            self._drop(issue_id, ids)
+
+    def seed(self, issue_id, worklogs):
+        """
+        Reemplaza los worklogs de un issue con la lista completa recibida y
+        devuelve los guardados (solo los campos de FIELDS).
+        """
+        issue_id = str(issue_id)
+        entries = [_compact(worklog, issue_id) for worklog in worklogs]
+        with self._lock:
+            self._drop(issue_id, self._by_issue.pop(issue_id, ()))
+            ids = set()
+            for entry in entries:
+                self._put(entry)
+                ids.add(entry[0])
+            self._by_issue[issue_id] = ids
+            self._evict()
+            self._dirty = True
+        return [_expand(entry) for entry in sorted(entries, key=lambda entry: entry[4])]
+
+    def apply_updates(self, worklogs):
+        """Aplica worklogs nuevos o modificados de issues ya cargados."""
+        applied = 0
+        with self._lock:
+            for worklog in worklogs:
+                issue_id = str(worklog.get('issueId'))
+                issue_ids = self._by_issue.get(issue_id)
+                if issue_ids is None:
+                    continue
+                entry = _compact(worklog, issue_id)
+                self._put(entry)
+                issue_ids.add(entry[0])
+                applied += 1
+            if applied:
+                self._dirty = True
+        return applied
+
+    def apply_deletions(self, worklog_ids):
+        removed = 0
+        with self._lock:
+            for wid in map(str, worklog_ids):
+                entry = self._worklogs.pop(wid, None)
+                if entry is None:
+                    continue
+                self._by_issue.get(entry[1], set()).discard(wid)
+                removed += 1
+            if removed:
+                self._dirty = True
+        return removed
+
+    def set_cursor(self, since):
+        with self._lock:
+            self.since = since
+            self._dirty = True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'issues': len(self._by_issue),
+                'worklogs': len(self._worklogs),
+                'since': self.since,
+            }
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if data.get('format') != STORE_FORMAT_VERSION:
+            return
+        with self._lock:
+            self._worklogs = {entry[0]: tuple(entry) for entry in data.get('worklogs', [])}
+            # El archivo guarda los issues del menos al más usado
+            self._by_issue = OrderedDict((iid, set(ids)) for iid, ids in data.get('by_issue', []))
+            self._evict()
+            self.since = data.get('since')
+            self._dirty = False
+
+    def save(self, force=False):
+        """
+        Persiste el almacén si hubo cambios (escritura atómica), como mucho
+        una vez cada save_interval segundos salvo que se fuerce.
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                if not force and time.monotonic() - self._last_save < self.save_interval:
+                    return
+                # Las tuplas son inmutables: alcanza con copiar las colecciones
+                # y serializar fuera del lock
+                data = {
+                    'format': STORE_FORMAT_VERSION,
+                    'since': self.since,
+                    'worklogs': list(self._worklogs.values()),
+                    'by_issue': [[iid, sorted(ids)] for iid, ids in self._by_issue.items()],
+                }
+                self._dirty = False
+                self._last_save = time.monotonic()
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                    json.dump(data, fh)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
@@ -0,0 +1,86 @@
+"""
+Exportación XLSX en streaming.
+
+Las hojas se escriben con openpyxl en modo write-only: cada fila se serializa
+directamente al XML de la hoja (en un archivo temporal) sin crear objetos de
+celda, así que la memoria no crece con la cantidad de filas. El libro
+terminado se guarda en un archivo temporal que se envía al cliente por bloques.
+
+En modo write-only los anchos de columna van en la cabecera de la hoja, antes
+que las filas; por eso cada hoja se define con una función que devuelve sus
+filas: una primera pasada solo mide el largo de cada valor y la segunda
+escribe las filas ya con los anchos fijados.
+"""
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+import export_cache
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+class ColumnWidths:
+    """Ancho de cada columna (largo máximo del texto + 2), actualizado fila a fila."""
+
+    def __init__(self):
+        self.lengths = []
+
+    def update(self, row):
+        for index, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if index == len(self.lengths):
+                self.lengths.append(length)
+            elif length > self.lengths[index]:
+                self.lengths[index] = length
+
+    def apply(self, ws):
+        for index, length in enumerate(self.lengths, start=1):
+            ws.column_dimensions[get_column_letter(index)].width = length + 2
+
+class StreamingWorkbook:
+    """Libro XLSX cuyas hojas se generan fila a fila al guardarlo."""
+
+    def __init__(self):
+        self._sheets = []
+
+    def add_sheet(self, title, rows, fit_columns=True):
+        """
+        Agrega una hoja. `rows` es una función sin argumentos que devuelve un
+        iterable de filas; con fit_columns se llama dos veces (medición y escritura).
+        """
+        self._sheets.append((title, rows, fit_columns))
+
+    def save(self, fileobj, progress=None):
+        """
+        Escribe el libro en fileobj. Si se indica, progress(rows_written,
+        rows_total) se llama después de cada fila escrita.
+        """
+        wb = Workbook(write_only=True)
+        measured = []
+        rows_total = 0
+        for title, rows, fit_columns in self._sheets:
+            widths = ColumnWidths() if fit_columns else None
+            if widths is not None or progress is not None:
+                for row in rows():
+                    rows_total += 1
+                    if widths is not None:
+                        widths.update(row)
+            measured.append((title, rows, widths))
+
+        rows_written = 0
+        for title, rows, widths in measured:
+            ws = wb.create_sheet(title=title)
+            if widths is not None:
+                widths.apply(ws)
+            for row in rows():
+                ws.append(row)
+                rows_written += 1
+                if progress is not None:
+                    progress(rows_written, rows_total)
+        wb.save(fileobj)
+
+def send_workbook(workbook, download_name, etag=None):
+    """
+    Guarda el libro y lo envía por bloques como adjunto. Con etag (ver
+    export_cache) el archivo queda además en la caché de exportaciones.
+    """
+    return export_cache.send_export(etag, download_name, XLSX_MIMETYPE, workbook.save)